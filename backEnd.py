@@ -1,5 +1,22 @@
 import os
+import re
+import csv
+import mmap
+import json
+import time
+import hashlib
+import threading
+import functools
+import tracemalloc
+from collections.abc import Mapping
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+import numpy as np
 import pandas as pd
+from pandas.api.types import union_categoricals
+
+from exportEngine import write_table, write_tables
 
 # Grade mapping for GPA calculation
 GRADE_MAP = {
@@ -21,10 +38,836 @@ GRADE_MAP = {
     "NP": None
 }
 
+# Below this many section files a process pool costs more than it saves
+PARALLEL_MIN_FILES = 64
+
+# Parse progress is reported every this many section files
+PROGRESS_INTERVAL = 100
+
+class ProcessingCancelled(Exception):
+    """Raised when a load is stopped through its cancel_event."""
+
+# Parsed section files are cached in this folder inside the data directory
+CACHE_DIR_NAME = ".gpa_cache"
+CACHE_VERSION = 1
+
+# Separators allowed around the quoted fields of a section row on the fast path
+ROW_FIELD_SEPARATORS = frozenset({',', ', '})
+ROW_LINE_SEPARATORS = frozenset({'\n', '\r\n'})
+
+def split_quoted_rows(body):
+    """
+    Split section rows whose three fields are all quoted, as in "Name","ID","Grade"
+    with or without a space after each comma, using a single split on the quotes.
+    Returns (names, ids, grades) lists, or None when some row needs the csv reader
+    (unquoted fields, blank lines, extra columns and so on).
+    """
+    body = body.strip()
+    if not body:
+        return [], [], []
+    # Quoted fields land at the odd positions and the text between them at the even ones
+    parts = body.split('"')
+    separators = parts[2:-1:2]
+    if (parts[0] or parts[-1] or len(separators) % 3 != 2
+            or not ROW_FIELD_SEPARATORS.issuperset(separators[0::3])
+            or not ROW_FIELD_SEPARATORS.issuperset(separators[1::3])
+            or not ROW_LINE_SEPARATORS.issuperset(separators[2::3])):
+        return None
+    fields = list(map(str.strip, parts[1::2]))
+    return fields[0::3], fields[1::3], fields[2::3]
+
+def read_csv_rows(lines):
+    """
+    Read "Name","ID","Grade" rows with the csv module, tolerating any quoting.
+    Rows with fewer than three fields are skipped. Returns (names, ids, grades) lists.
+    """
+    names, ids, grades = [], [], []
+    for row in csv.reader(lines, skipinitialspace=True):
+        if len(row) < 3:
+            continue
+        names.append(row[0].replace('"', '').strip())
+        ids.append(row[1].replace('"', '').strip())
+        grades.append(row[2].replace('"', '').strip())
+    return names, ids, grades
+
+def parse_section_file(file_path, fast_path=True):
+    """
+    Parse a .sec file in one pass: the header line holds the section name and
+    optional credit hours, the rest are "Name","ID","Grade" rows.
+    Fully quoted files are split directly; anything else goes through the csv reader,
+    which is also used for every file when fast_path is False.
+    Returns plain lists so results are cheap to send back from worker processes.
+    """
+    with open(file_path, 'rb') as f:
+        return parse_section_bytes(f.read(), fast_path)
+
+def parse_section_bytes(data, fast_path=True):
+    """Parse the raw bytes of one section record, as parse_section_file does for a file."""
+    text = data.decode('utf-8', errors='replace')
+    header, _, body = text.partition('\n')
+    columns = None
+    # A carriage return inside the header means old Mac line endings; leave those to splitlines
+    if fast_path and '\r' not in header.rstrip('\r'):
+        columns = split_quoted_rows(body)
+    if columns is None:
+        lines = text.splitlines()
+        header = lines[0]
+        columns = read_csv_rows(lines[1:])
+    
+    header_parts = header.split()
+    section_name = header_parts[0]
+    # Extract credit hours if provided; default to 3.0 otherwise
+    credit_hours = float(header_parts[1]) if len(header_parts) > 1 else 3.0
+    
+    names, ids, grades = columns
+    return {
+        'section': section_name,
+        'credit_hours': credit_hours,
+        'names': names,
+        'ids': ids,
+        'grades': grades,
+        'sha1': hashlib.sha1(data).hexdigest()
+    }
+
+# Section bundles hold many .sec records back to back, each starting with its header line
+BUNDLE_EXTENSION = '.secbundle'
+
+# A header line has no comma and does not start with a quote or space; every row has commas
+SECTION_HEADER_LINE = re.compile(rb'^[^",\s][^,\n]*$', re.MULTILINE)
+
+# Bundle records are parsed in batches of this many sections, one task per batch
+BUNDLE_BATCH_SECTIONS = 100
+
+def section_record_ranges(buffer):
+    """
+    Split a bundle's bytes (or an mmap of it) at its header lines without copying them.
+    Returns a list of (start, stop) byte offsets, one per section record.
+    """
+    starts = [match.start() for match in SECTION_HEADER_LINE.finditer(buffer)]
+    if not starts:
+        if bytes(buffer[:]).strip():
+            raise ValueError("no section header line found")
+        return []
+    if bytes(buffer[:starts[0]]).strip():
+        raise ValueError("rows found before the first section header")
+    return list(zip(starts, starts[1:] + [len(buffer)]))
+
+def read_bundle_ranges(bundle_path):
+    """Byte ranges of the section records in a bundle file, found through mmap."""
+    if os.path.getsize(bundle_path) == 0:
+        return []
+    with open(bundle_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        return section_record_ranges(buffer)
+
+def parse_bundle_records(bundle_path, ranges):
+    """
+    Parse the section records at the given byte ranges of a bundle.
+    The bundle is mapped rather than read, so only the records asked for are touched.
+    """
+    with open(bundle_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        return [parse_section_bytes(buffer[start:stop]) for start, stop in ranges]
+
+def parse_group_file(file_path):
+    """
+    Parse a .grp file: the first line is the group name, the rest are section file names.
+    """
+    with open(file_path, 'r') as f:
+        group_name = f.readline().strip()  # First line is group name
+        sections = [line.strip() for line in f if line.strip()]
+    
+    normalized_sections = [s.replace('.SEC', '').replace('.sec', '') for s in sections]
+    return pd.DataFrame({
+        'Group Name': [group_name] * len(normalized_sections),
+        'Section': normalized_sections
+    })
+
+def parse_run_file(file_path):
+    """
+    Parse a .run/.runthis file: the first line is the semester, the rest are group file names.
+    """
+    with open(file_path, 'r') as f:
+        semester = f.readline().strip()  # First line: semester info
+        groups = [line.strip() for line in f if line.strip()]
+    
+    normalized_groups = [g.replace('.grp', '').replace('.GRP', '') for g in groups]
+    return pd.DataFrame({
+        'Semester': [semester] * len(normalized_groups),
+        'Group': normalized_groups
+    })
+
+# Columns of the student history store, one row per student, section and list
+HISTORY_COLUMNS = ['ID', 'Name', 'Section', 'Grade', 'List']
+
+def parse_list_file(file_path, list_type):
+    """
+    Parse a good.lst or work.lst history file. Each student has a header line
+    "ID","Name", count followed by count lines of "SECTION","GRADE".
+    Returns a DataFrame with the HISTORY_COLUMNS, List set to list_type.
+    """
+    with open(file_path, 'r', encoding='utf-8', errors='replace', newline='') as f:
+        rows = [[field.strip() for field in row] for row in csv.reader(f, skipinitialspace=True) if row]
+    
+    records = []
+    i = 0
+    while i < len(rows):
+        header = rows[i]
+        if len(header) < 3 or not header[2].isdigit():
+            raise ValueError(f"{os.path.basename(file_path)}: expected a student header on entry {i + 1}, got {header}")
+        student_id, name, count = header[0], header[1], int(header[2])
+        for row in rows[i + 1:i + 1 + count]:
+            records.append((student_id, name, row[0], row[1] if len(row) > 1 else "", list_type))
+        i += 1 + count
+    return pd.DataFrame(records, columns=HISTORY_COLUMNS)
+
+def list_file_type(file_name):
+    """'good' or 'work' for good/work list history files (e.g. good.lst, work_F24.lst), else None."""
+    stem = file_name.lower()
+    if not stem.endswith('.lst'):
+        return None
+    for list_type in ('good', 'work'):
+        if stem.startswith(list_type):
+            return list_type
+    return None
+
+def file_digest(file_path):
+    """SHA-1 of a file's contents, used to spot files that were touched but not changed."""
+    with open(file_path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def load_section_cache(directory):
+    """
+    Load the parsed-section cache for a directory.
+    Returns (files, rows): files maps file name -> manifest entry (mtime_ns, size, sha1,
+    section, credit_hours and its start/stop in rows); rows holds Name/ID/Grade columns.
+    Returns ({}, None) when there is no usable cache.
+    """
+    cache_dir = os.path.join(directory, CACHE_DIR_NAME)
+    if not os.path.isdir(cache_dir):
+        return {}, None
+    try:
+        with open(os.path.join(cache_dir, 'manifest.json'), 'r') as f:
+            manifest = json.load(f)
+        if manifest.get('version') != CACHE_VERSION:
+            return {}, None
+        rows = pd.read_pickle(os.path.join(cache_dir, 'sections.pkl'))
+    except Exception as e:
+        print(f"Ignoring unreadable cache in {cache_dir}: {e}")
+        return {}, None
+    return manifest['files'], rows
+
+def save_section_cache(directory, entries):
+    """
+    Write the parsed-section cache for a directory.
+    entries is a list of (file name, os.stat result, parsed section) in directory order.
+    """
+    files = {}
+    start = 0
+    for file, stat, parsed in entries:
+        stop = start + len(parsed['ids'])
+        files[file] = {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha1': parsed['sha1'],
+            'section': parsed['section'],
+            'credit_hours': parsed['credit_hours'],
+            'start': start,
+            'stop': stop
+        }
+        start = stop
+    rows = pd.DataFrame({
+        column: pd.Categorical(list(chain.from_iterable(parsed[key] for _, _, parsed in entries)))
+        for column, key in (('Name', 'names'), ('ID', 'ids'), ('Grade', 'grades'))
+    })
+    
+    cache_dir = os.path.join(directory, CACHE_DIR_NAME)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to temporary files first so an interrupted save never leaves a half-written cache
+        rows.to_pickle(os.path.join(cache_dir, 'sections.pkl.tmp'))
+        with open(os.path.join(cache_dir, 'manifest.json.tmp'), 'w') as f:
+            json.dump({'version': CACHE_VERSION, 'files': files}, f)
+        os.replace(os.path.join(cache_dir, 'sections.pkl.tmp'), os.path.join(cache_dir, 'sections.pkl'))
+        os.replace(os.path.join(cache_dir, 'manifest.json.tmp'), os.path.join(cache_dir, 'manifest.json'))
+    except OSError as e:
+        # A read-only data directory just means no cache next time
+        print(f"Could not write cache in {cache_dir}: {e}")
+
+def cached_section(entry, columns):
+    """Rebuild a parsed section from its manifest entry and the decoded cache columns."""
+    start, stop = entry['start'], entry['stop']
+    return {
+        'section': entry['section'],
+        'credit_hours': entry['credit_hours'],
+        'names': columns['Name'][start:stop],
+        'ids': columns['ID'][start:stop],
+        'grades': columns['Grade'][start:stop],
+        'sha1': entry['sha1']
+    }
+
+# Letter grades reported in grade distributions, best to worst
+DISTRIBUTION_GRADES = ["A", "A-", "B+", "B", "B-", "C+", "C", "C-", "D+", "D", "D-", "F"]
+
+# Grade cutoffs for the Good List (at or above) and Work List (at or below)
+GOOD_LIST_MIN_GRADE = "A"
+WORK_LIST_MAX_GRADE = "D+"
+
+# Columns each per-section DataFrame exposes
+SECTION_COLUMNS = ["Name", "ID", "Grade", "Numeric Grade"]
+
+def build_grade_store(parsed_sections):
+    """
+    Concatenate parsed section files into one columnar table with a row per enrollment.
+    Section, Name, ID and Grade are categorical; rows of a section are contiguous.
+    Returns (store, slices) where slices maps section name -> (start, stop) rows.
+    """
+    parsed_sections = list(parsed_sections)
+    section_names = [parsed['section'] for parsed in parsed_sections]
+    lengths = np.array([len(parsed['ids']) for parsed in parsed_sections], dtype=np.int64)
+    credit_hours = np.array([parsed['credit_hours'] for parsed in parsed_sections], dtype=np.float32)
+    
+    grades = pd.Categorical(list(chain.from_iterable(parsed['grades'] for parsed in parsed_sections)))
+    # Look up grade points once per distinct grade rather than once per row
+    grade_points = np.array([np.nan if GRADE_MAP.get(g) is None else GRADE_MAP[g]
+                             for g in grades.categories], dtype=np.float64)
+    store = pd.DataFrame({
+        'Section': pd.Categorical.from_codes(np.repeat(np.arange(len(section_names)), lengths),
+                                             categories=section_names),
+        'Name': pd.Categorical(list(chain.from_iterable(parsed['names'] for parsed in parsed_sections))),
+        'ID': pd.Categorical(list(chain.from_iterable(parsed['ids'] for parsed in parsed_sections))),
+        'Grade': grades,
+        'Credit Hours': np.repeat(credit_hours, lengths),
+        'Numeric Grade': grade_points[grades.codes] if len(grades) else np.empty(0)
+    })
+    
+    stops = np.cumsum(lengths)
+    slices = {name: (int(stop - length), int(stop))
+              for name, length, stop in zip(section_names, lengths, stops)}
+    return store, slices
+
+def build_section_stats(store, credit_hours):
+    """
+    Per-section sufficient statistics, computed once per load.
+    Columns: points (sum of grade points), graded (students with a GPA grade),
+    credit_hours, and one count column per letter grade in DISTRIBUTION_GRADES.
+    """
+    section_names = store['Section'].cat.categories
+    section_codes = store['Section'].cat.codes.to_numpy(np.int64)
+    numeric = store['Numeric Grade'].to_numpy()
+    graded = ~np.isnan(numeric)
+    
+    stats = pd.DataFrame({
+        'points': np.bincount(section_codes[graded], weights=numeric[graded], minlength=len(section_names)),
+        'graded': np.bincount(section_codes[graded], minlength=len(section_names)),
+        'credit_hours': [credit_hours.get(name, 3.0) for name in section_names]
+    }, index=pd.Index(section_names, name='Section'))
+    
+    # Count every (section, grade) pair in one pass, then keep the reported grades
+    grade_categories = store['Grade'].cat.categories
+    grade_codes = store['Grade'].cat.codes.to_numpy(np.int64)
+    counts = np.bincount(section_codes * len(grade_categories) + grade_codes,
+                         minlength=len(section_names) * len(grade_categories))
+    counts = counts.reshape(len(section_names), len(grade_categories))
+    for grade in DISTRIBUTION_GRADES:
+        stats[grade] = counts[:, grade_categories.get_loc(grade)] if grade in grade_categories else 0
+    return stats
+
+# Terms within a calendar year, earliest first: Winter, Spring, Summer, Fall
+TERM_SEASONS = "WSUF"
+
+# Two-digit years from CENTURY_PIVOT up are 19YY and the rest 20YY, as with strptime's %y
+CENTURY_PIVOT = 69
+
+# Section codes such as COMSC330.01F18: course, section number, then season letter and two-digit year
+SECTION_CODE_PATTERN = r'^(?P<Course>[^.]+)\.(?P<Number>[^.]*?)(?P<Season>[A-Za-z])(?P<Year>\d{2})$'
+
+def parse_section_codes(section_names):
+    """
+    Split section codes into their course, section number and term, e.g. COMSC330.01F18
+    into COMSC330, 01 and F18. Returns a DataFrame indexed by section name with Course,
+    Number, Term and Term Key columns. Term is an ordered categorical whose categories are
+    the sorted term index, oldest first; Term Key is the matching sort number. Two-digit
+    years are placed in a century by CENTURY_PIVOT, so F98 comes before S02.
+    A code that does not follow the pattern keeps the whole code as its Course and no term.
+    """
+    names = pd.Index(section_names, name='Section')
+    parts = pd.Series(names.astype(str), index=names).str.extract(SECTION_CODE_PATTERN)
+    season = parts['Season'].str.upper()
+    season_rank = season.map({letter: rank for rank, letter in enumerate(TERM_SEASONS)}).astype(float)
+    two_digit_year = parts['Year'].astype(float)
+    year = two_digit_year + np.where(two_digit_year >= CENTURY_PIVOT, 1900, 2000)
+    term_key = year * len(TERM_SEASONS) + season_rank
+    known = term_key.notna()
+    terms = (season + parts['Year']).where(known)
+    
+    # Each distinct term once, ordered by its key
+    term_index = term_key[known].groupby(terms[known]).first().sort_values().index
+    return pd.DataFrame({
+        'Course': parts['Course'].where(known, names.to_series(index=names)),
+        'Number': parts['Number'].where(known),
+        'Term': pd.Categorical(terms, categories=term_index, ordered=True),
+        'Term Key': term_key
+    }, index=names)
+
+def compute_z_scores(gpas):
+    """
+    Population z-scores for a Series of GPAs indexed by name; missing GPAs are skipped.
+    A single GPA, or a set of identical GPAs, gets a z-score of 0.
+    """
+    gpas = gpas.dropna().astype(float)
+    if len(gpas) < 2:
+        return dict.fromkeys(gpas.index, 0.0)
+    std_dev = gpas.std(ddof=0)
+    if std_dev > 0:  # Avoid division by zero
+        z_scores = (gpas - gpas.mean()) / std_dev
+    else:
+        z_scores = gpas * 0.0
+    return dict(zip(gpas.index, z_scores.tolist()))
+
+def merge_grade_stores(store, new_store):
+    """
+    Append new_store's rows to store, merging the categories of each categorical column.
+    """
+    merged = {}
+    for column in ('Section', 'Name', 'ID', 'Grade'):
+        # An empty side may carry a different category dtype, so only union real rows
+        parts = [part[column] for part in (store, new_store) if len(part)] or [store[column]]
+        combined = union_categoricals(parts, ignore_order=True)
+        merged[column] = combined.remove_unused_categories() if column != 'Section' else combined
+    merged['Credit Hours'] = np.concatenate([store['Credit Hours'].to_numpy(), new_store['Credit Hours'].to_numpy()])
+    merged['Numeric Grade'] = np.concatenate([store['Numeric Grade'].to_numpy(), new_store['Numeric Grade'].to_numpy()])
+    return pd.DataFrame(merged)
+
+# The five exports, named as the files export_all writes
+EXPORT_NAMES = ['section_data', 'group_data', 'good_list', 'work_list', 'history']
+
+def sort_filter_table(table, sort_column=None, descending=False, filter_text=""):
+    """
+    Return the rows of table whose text columns contain filter_text (case-insensitive),
+    sorted by sort_column with missing values last. Ties keep their original order.
+    """
+    if filter_text:
+        mask = np.zeros(len(table), dtype=bool)
+        for column in table.columns:
+            if table[column].dtype == object or pd.api.types.is_string_dtype(table[column]):
+                mask |= table[column].str.contains(filter_text, case=False, regex=False, na=False).to_numpy()
+        table = table[mask]
+    if sort_column is not None:
+        table = table.sort_values(sort_column, ascending=not descending, kind='stable', na_position='last')
+    return table.reset_index(drop=True)
+
+class SectionView(Mapping):
+    """
+    Read-only dict-like view of the grade store, keyed by section name.
+    Each section's DataFrame is sliced out of the store only when it is accessed.
+    """
+    def __init__(self, store, slices, names=None):
+        self.store = store
+        self.slices = slices
+        self.names = list(slices) if names is None else list(names)
+        self._name_set = set(self.names)
+
+    def __getitem__(self, section_name):
+        if section_name not in self._name_set:
+            raise KeyError(section_name)
+        start, stop = self.slices[section_name]
+        return self.store.iloc[start:stop][SECTION_COLUMNS].reset_index(drop=True)
+
+    def __contains__(self, section_name):
+        return section_name in self._name_set
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def copy(self):
+        return SectionView(self.store, self.slices, self.names)
+
+    def subset(self, section_names):
+        """Return a view restricted to the given sections, keeping load order."""
+        section_names = set(section_names)
+        return SectionView(self.store, self.slices, [n for n in self.names if n in section_names])
+
+class StudentIndex:
+    """
+    Maps each student ID to their rows in the grade store.
+    Built once per load so a student's enrollments are found without scanning every section.
+    """
+    def __init__(self, store):
+        codes = store['ID'].cat.codes.to_numpy()
+        self.ids = store['ID'].cat.categories
+        # Store rows grouped by student; offsets[code]:offsets[code + 1] are that student's rows
+        self.rows = np.argsort(codes, kind='stable')
+        self.offsets = np.searchsorted(codes[self.rows], np.arange(len(self.ids) + 1))
+
+    def codes_for(self, student_ids):
+        """Return the ID code for each student ID, or -1 for unknown IDs."""
+        return self.ids.get_indexer(list(student_ids))
+
+    def rows_for(self, student_id):
+        code = self.codes_for([student_id])[0]
+        if code < 0:
+            return self.rows[:0]
+        return self.rows[self.offsets[code]:self.offsets[code + 1]]
+
+class StudentList(Mapping):
+    """
+    Read-only good/work list mapping student ID -> {'name': ..., 'classes': [section names]}.
+    Students, names and classes are kept as integer codes into shared string tables (the
+    grade store's categories) rather than a dict and a list of strings per student.
+    Entries are built when accessed; iteration follows list order.
+    """
+    def __init__(self, ids, names, sections, id_codes, name_codes, offsets, section_codes):
+        self.ids = ids                      # String tables (pd.Index) the codes refer to
+        self.names = names
+        self.sections = sections
+        self.id_codes = id_codes            # One code per student, in list order
+        self.name_codes = name_codes
+        # Student i's classes are section_codes[offsets[i]:offsets[i + 1]]
+        self.offsets = offsets
+        self.section_codes = section_codes
+        self._positions = None              # ID code -> position in the list, built on first lookup
+        self._section_values = None         # Section table as a list, for cheap lookups
+
+    @classmethod
+    def empty(cls, ids=None, names=None, sections=None):
+        no_strings = pd.Index([], dtype=object)
+        no_codes = np.empty(0, dtype=np.int32)
+        return cls(no_strings if ids is None else ids, no_strings if names is None else names,
+                   no_strings if sections is None else sections,
+                   no_codes, no_codes, np.zeros(1, dtype=np.int64), no_codes)
+
+    @classmethod
+    def from_rows(cls, ids, names, sections, id_codes, name_codes, section_codes):
+        """
+        Group rows, given as codes into the ids, names and sections tables, by student.
+        Students keep the order in which they first appear, their classes keep row order,
+        and each student's name comes from their first row.
+        """
+        id_codes = np.asarray(id_codes)
+        if len(id_codes) == 0:
+            return cls.empty(ids, names, sections)
+        # One stable sort groups rows by student, a second orders the groups by first row
+        order = np.argsort(id_codes, kind='stable')
+        sorted_codes = id_codes[order]
+        starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+        lengths = np.diff(np.r_[starts, len(order)])
+        first_rows = order[starts]
+        rows = order[np.argsort(np.repeat(first_rows, lengths), kind='stable')]
+        student_order = np.argsort(first_rows, kind='stable')
+        return cls(ids, names, sections,
+                   sorted_codes[starts][student_order].astype(np.int32),
+                   np.asarray(name_codes)[first_rows[student_order]].astype(np.int32),
+                   np.r_[0, np.cumsum(lengths[student_order])].astype(np.int64),
+                   np.asarray(section_codes)[rows].astype(np.int32))
+
+    @classmethod
+    def from_records(cls, student_ids, names, sections):
+        """Build a list from one (ID, name, section) triple per class, interning the strings."""
+        id_codes, ids = pd.factorize(np.asarray(student_ids, dtype=object))
+        name_codes, name_table = pd.factorize(np.asarray(names, dtype=object))
+        section_codes, section_table = pd.factorize(np.asarray(sections, dtype=object))
+        return cls.from_rows(pd.Index(ids), pd.Index(name_table), pd.Index(section_table),
+                             id_codes, name_codes, section_codes)
+
+    def _position(self, student_id):
+        if self._positions is None:
+            self._positions = np.full(len(self.ids), -1, dtype=np.int64)
+            self._positions[self.id_codes] = np.arange(len(self.id_codes))
+        position = self._positions[self.ids.get_loc(student_id)]  # KeyError for unknown IDs
+        if position < 0:
+            raise KeyError(student_id)
+        return position
+
+    def _classes(self, position):
+        if self._section_values is None:
+            self._section_values = self.sections.tolist()
+        start, stop = self.offsets[position], self.offsets[position + 1]
+        return [self._section_values[code] for code in self.section_codes[start:stop].tolist()]
+
+    def __contains__(self, student_id):
+        try:
+            self._position(student_id)
+        except KeyError:
+            return False
+        return True
+
+    def __getitem__(self, student_id):
+        position = self._position(student_id)
+        return {'name': self.names[self.name_codes[position]], 'classes': self._classes(position)}
+
+    def __iter__(self):
+        return iter(self.student_ids())
+
+    def __len__(self):
+        return len(self.id_codes)
+
+    def items(self):
+        """(student ID, entry) pairs in list order, without a lookup per student."""
+        for position, (student_id, name) in enumerate(zip(self.student_ids(), self.student_names())):
+            yield student_id, {'name': name, 'classes': self._classes(position)}
+
+    def student_ids(self):
+        return self.ids.take(self.id_codes).tolist()
+
+    def student_names(self):
+        return self.names.take(self.name_codes).tolist()
+
+    def joined_classes(self, separator=", "):
+        """Each student's classes joined into one string, in list order."""
+        return [separator.join(self._classes(position)) for position in range(len(self))]
+
+    def rows(self):
+        """(IDs, names, sections) object arrays with one entry per class, in list order."""
+        counts = np.diff(self.offsets)
+        return (np.asarray(self.ids.take(np.repeat(self.id_codes, counts)), dtype=object),
+                np.asarray(self.names.take(np.repeat(self.name_codes, counts)), dtype=object),
+                np.asarray(self.sections.take(self.section_codes), dtype=object))
+
+class HistoryStore:
+    """
+    Good and work list entries from earlier terms, indexed by student ID.
+    Entries from good.lst/work.lst files accumulate across loads and can be saved to a
+    file, so history covers many terms without reloading their section files.
+    """
+    def __init__(self, records=None):
+        if records is None:
+            records = pd.DataFrame(columns=HISTORY_COLUMNS)
+        # The same entry seen in several files counts once
+        records = records.drop_duplicates(['ID', 'Section', 'List'])
+        self.records = pd.DataFrame({column: pd.Categorical(np.asarray(records[column], dtype=object))
+                                     for column in HISTORY_COLUMNS})
+        self.index = StudentIndex(self.records)
+
+    def __len__(self):
+        return len(self.records)
+
+    def add(self, records):
+        """Add entries (a DataFrame with the HISTORY_COLUMNS); ones already stored are ignored."""
+        combined = pd.concat([self.records.astype(object), records.astype(object)], ignore_index=True)
+        self.__init__(combined)
+
+    def entries_for(self, student_ids):
+        """Rows for the given students, in store order."""
+        codes = self.index.codes_for(student_ids)
+        mask = np.isin(self.records['ID'].cat.codes.to_numpy(), codes[codes >= 0])
+        return self.records[mask]
+
+    def get_student_history(self, student_id):
+        """A student's history rows: Section, Grade and List."""
+        return self.records.iloc[self.index.rows_for(student_id)][['Section', 'Grade', 'List']]
+
+    def save(self, file_path):
+        # Write a temporary file first so an interrupted save keeps the old history
+        try:
+            self.records.to_pickle(file_path + '.tmp')
+            os.replace(file_path + '.tmp', file_path)
+        except OSError as e:
+            print(f"Could not save student history to {file_path}: {e}")
+
+    @classmethod
+    def load(cls, file_path):
+        """Load a saved store, or return an empty one if the file is missing or unreadable."""
+        if not os.path.exists(file_path):
+            return cls()
+        try:
+            return cls(pd.read_pickle(file_path))
+        except Exception as e:
+            print(f"Ignoring unreadable student history in {file_path}: {e}")
+            return cls()
+
+# Course codes such as COMSC330: department letters, then the course number
+COURSE_CODE_PATTERN = r'^(?P<Department>[A-Za-z]+)(?P<Number>\d+)'
+
+class GradeCube:
+    """
+    Grade counts and credit-weighted grade points over department, course level, course,
+    term and group membership, built once per load so questions like "COMSC335 across all
+    terms" or "all 300-level in F20" need no new .grp/.run files.
+    Each cell holds the sections sharing a course, a term and the same set of groups, so
+    a section listed by several groups is still counted once when groups are rolled up.
+    """
+    DIMENSIONS = ['Department', 'Level', 'Course', 'Term', 'Group']
+
+    def __init__(self, section_stats, section_terms, group_members):
+        section_names = section_stats.index
+        
+        # The set of groups listing each section, numbered in order of first appearance
+        self.groups = pd.Index(pd.unique(group_members['Group Key']), name='Group')
+        member_sections = section_names.get_indexer(group_members['Section'])
+        member_groups = self.groups.get_indexer(group_members['Group Key'])
+        known = member_sections >= 0
+        pairs = (pd.DataFrame({'section': member_sections[known], 'group': member_groups[known]})
+                 .drop_duplicates().sort_values(['section', 'group']))
+        pair_sections, pair_groups = pairs['section'].to_numpy(), pairs['group'].to_numpy()
+        starts = np.flatnonzero(np.diff(pair_sections, prepend=-1))
+        group_set_codes = {(): 0}
+        membership = np.zeros(len(section_names), dtype=np.int64)
+        membership[pair_sections[starts]] = [group_set_codes.setdefault(tuple(group_set), len(group_set_codes))
+                                             for group_set in np.split(pair_groups, starts[1:])]
+        self.membership_groups = np.zeros((len(group_set_codes), len(self.groups)), dtype=bool)
+        for group_set, code in group_set_codes.items():
+            self.membership_groups[code, list(group_set)] = True
+        
+        # Department and level come from the course code, parsed once per course
+        course = section_terms['Course'].reindex(section_names)
+        course_codes, courses = pd.factorize(course)
+        course_parts = pd.Series(courses.astype(str)).str.extract(COURSE_CODE_PATTERN)
+        levels = (course_parts['Number'].astype(float) // 100 * 100).astype('Int64')
+        sections = pd.DataFrame({
+            'Department': course_parts['Department'].take(course_codes).to_numpy(),
+            'Level': levels.take(course_codes).to_numpy(),
+            'Course': course,
+            'Term': section_terms['Term'].reindex(section_names),
+            'membership': membership,
+            'Sections': 1,
+            'Graded': section_stats['graded'],
+            'points': section_stats['points'] * section_stats['credit_hours'],
+            'credits': section_stats['graded'] * section_stats['credit_hours']
+        }, index=section_names)
+        for grade in DISTRIBUTION_GRADES:
+            sections[grade] = section_stats[grade]
+        self.cells = (sections.groupby(['Department', 'Level', 'Course', 'Term', 'membership'],
+                                       observed=True, dropna=False, sort=True)
+                      .sum().reset_index())
+
+    def query(self, by=('Course', 'Term'), departments=None, levels=None, courses=None, terms=None, groups=None):
+        """
+        Roll the cube up to the dimensions in by (any of DIMENSIONS, or none for a single total),
+        keeping only cells that match every filter given. groups keeps sections listed by any
+        of those groups (.grp file names, as in group_dfs).
+        Returns a DataFrame with the by columns, then Sections, Graded, GPA and one count column
+        per letter grade in DISTRIBUTION_GRADES; GPA is weighted by credit hours as
+        calculate_all_gpas does. With Group in by, a section counts towards every group listing it.
+        """
+        by = list(by)
+        for dimension in by:
+            if dimension not in self.DIMENSIONS:
+                raise ValueError(f"Unknown cube dimension '{dimension}'.")
+        cells = self.cells
+        keep = np.ones(len(cells), dtype=bool)
+        for column, values in (('Department', departments), ('Level', levels), ('Course', courses), ('Term', terms)):
+            if values is not None:
+                keep &= cells[column].isin(list(values)).to_numpy()
+        group_filter = np.ones(len(self.groups), dtype=bool)
+        if groups is not None:
+            group_filter = self.groups.isin(list(groups))
+            keep &= self.membership_groups[:, group_filter].any(axis=1)[cells['membership'].to_numpy()]
+        cells = cells[keep]
+        
+        if 'Group' in by:
+            # One row per (cell, group) pair so each group gets all of its sections
+            cell_rows, group_positions = np.nonzero(
+                self.membership_groups[cells['membership'].to_numpy()] & group_filter)
+            cells = cells.iloc[cell_rows].assign(Group=self.groups[group_positions])
+        measures = ['Sections', 'Graded', 'points', 'credits'] + DISTRIBUTION_GRADES
+        if by:
+            table = cells.groupby(by, observed=True, dropna=False, sort=True)[measures].sum().reset_index()
+        else:
+            table = pd.DataFrame({measure: [cells[measure].sum()] for measure in measures})
+        table['GPA'] = table['points'] / table['credits'].where(table['credits'] > 0)
+        return table[by + ['Sections', 'Graded', 'GPA'] + DISTRIBUTION_GRADES]
+
+class StageProfiler:
+    """
+    Opt-in recorder of wall time, rows processed and peak memory per pipeline stage.
+    While disabled, stages cost only a flag check.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.track_memory = False
+        self.records = []
+        self._peaks = []  # Running peak memory of each open stage, innermost last
+
+    def enable(self, track_memory=True):
+        self.enabled = True
+        self.track_memory = track_memory
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def disable(self):
+        self.enabled = False
+        if self.track_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.track_memory = False
+
+    def clear(self):
+        self.records = []
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        """
+        Time the enclosed block as one stage. The yielded record can be updated, e.g.
+        record['rows'] = n once the number of rows processed is known.
+        """
+        if not self.enabled:
+            yield {}
+            return
+        record = {'stage': name, 'rows': rows, 'seconds': None, 'peak_mb': None}
+        track_memory = self.track_memory and tracemalloc.is_tracing()
+        if track_memory:
+            start_memory, peak = tracemalloc.get_traced_memory()
+            # tracemalloc has one global peak, so hand the enclosing stage its peak so far
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+            tracemalloc.reset_peak()
+            self._peaks.append(start_memory)
+        start_time = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = time.perf_counter() - start_time
+            if track_memory:
+                peak = max(self._peaks.pop(), tracemalloc.get_traced_memory()[1])
+                record['peak_mb'] = (peak - start_memory) / (1024 * 1024)
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], peak)
+                tracemalloc.reset_peak()
+            self.records.append(record)
+
+    def report(self):
+        """Return the recorded stages, oldest first, as a list of dictionaries."""
+        return [dict(record) for record in self.records]
+
+    def summary_text(self):
+        """One line per stage, for display in the dashboard."""
+        lines = []
+        for record in self.records:
+            line = f"{record['stage']}: {record['seconds']:.3f}s"
+            if record['rows'] is not None:
+                line += f", {record['rows']} rows"
+            if record['peak_mb'] is not None:
+                line += f", peak {record['peak_mb']:.1f} MB"
+            lines.append(line)
+        return "\n".join(lines)
+
+def profiled(stage_name, rows=None):
+    """
+    Decorator that records a method call as a stage on self.profiler.
+    rows, if given, is called with self after the method returns to count rows processed.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.profiler.stage(stage_name) as record:
+                result = method(self, *args, **kwargs)
+                if rows is not None and self.profiler.enabled:
+                    record['rows'] = rows(self)
+            return result
+        return wrapper
+    return decorator
+
 class GPAProcessor:
     def __init__(self):
+        # All enrollments from .sec files, one row per student per section
+        self.grade_store, section_slices = build_grade_store([])
+        
         # Separate dictionaries for different file types
-        self.section_dfs = {}  # Keyed by section name from .sec files
+        self.section_dfs = SectionView(self.grade_store, section_slices)  # Keyed by section name from .sec files
+        self.student_index = StudentIndex(self.grade_store)
+        self._student_totals = None  # Per-student (points, credits) for the selected sections
+        self._table_cache = {}  # Student list and history tables, see _clear_student_caches
         self.group_dfs = {}    # Keyed by file name from .grp files
         self.run_dfs = {}      # Keyed by file name from .run or .runthis files
         
@@ -32,15 +875,62 @@ class GPAProcessor:
         self.group_gpas = {}
         self.section_z_scores = {}  # New: store z-scores for sections
         self.group_z_scores = {}    # New: store z-scores for groups
-        self.good_list = {}
-        self.work_list = {}
+        self.good_list = StudentList.empty()
+        self.work_list = StudentList.empty()
         self.section_credit_hours = {}  # Store credit hours per section
+        self.section_stats = build_section_stats(self.grade_store, self.section_credit_hours)
+        self.section_terms = parse_section_codes(self.section_stats.index)  # Course / number / term per section
+        self._all_group_members = self._build_group_members({})
+        self.grade_cube = GradeCube(self.section_stats, self.section_terms, self._all_group_members)
 
         # These will store the original data for re-filtering on run selection
-        self.all_section_dfs = {}
+        self.all_section_dfs = self.section_dfs.copy()
         self.all_group_dfs = {}
         self.student_history = {}  # Track students across good/work lists
+        self.history = HistoryStore()  # Earlier terms' good/work lists, from .lst files
+        self.history_path = None  # Where self.history is saved, see open_history
+        self.load_stats = {}  # Timing of the last load_files_to_dataframes call
+        self.profiler = StageProfiler()  # Per-stage timings, see enable_profiling
+        
+        # Watch mode: what was loaded from where, so changed files can be re-ingested alone
+        self.directory = None
+        self.selected_run = None        # Run applied with select_run, None for all data
+        self._file_signatures = {}      # File name -> (mtime_ns, size) at last load/refresh
+        self._section_files = {}        # .sec or bundle file name -> section names it holds
     
+    def enable_profiling(self, track_memory=True):
+        """
+        Start recording wall time, rows processed and (optionally) peak memory per stage.
+        Memory tracking uses tracemalloc, which slows processing noticeably.
+        """
+        self.profiler.enable(track_memory=track_memory)
+
+    def disable_profiling(self):
+        self.profiler.disable()
+
+    def get_profile_report(self):
+        """
+        Recorded stages as a list of {'stage', 'rows', 'seconds', 'peak_mb'} dictionaries.
+        """
+        return self.profiler.report()
+
+    def open_history(self, file_path, autosave=True):
+        """
+        Use the student history saved in file_path (created on first save).
+        History from .lst files loaded afterwards is added to it and, with autosave, saved back.
+        """
+        self.history = HistoryStore.load(file_path)
+        self.history_path = file_path if autosave else None
+        self._table_cache = {}
+
+    def _clear_student_caches(self):
+        """
+        Drop per-student results derived from the selected sections or the good/work lists.
+        Called whenever either changes; the results are rebuilt on next use.
+        """
+        self._student_totals = None
+        self._table_cache = {}
+
     def reset_to_all_data(self):
         """
         Reset to show data from all runs by restoring all sections and groups from original data.
@@ -48,193 +938,561 @@ class GPAProcessor:
         # Restore all groups and sections from original data
         self.group_dfs = self.all_group_dfs.copy()
         self.section_dfs = self.all_section_dfs.copy()
+        self.selected_run = None
+        self._clear_student_caches()
         
-    def load_files_to_dataframes(self, directory):
+    @profiled('load', rows=lambda self: len(self.grade_store))
+    def load_files_to_dataframes(self, directory, workers=1, use_cache=False, progress=None, cancel_event=None):
         """
         Load all .run, .grp, .sec, and .runthis files from the specified directory.
+        good*.lst and work*.lst files are added to the student history store.
+        Section files are read in a single pass each. With workers > 1 (or None for
+        one worker per core) they are parsed in a process pool and merged afterwards.
+        With use_cache, parsed sections are kept in a cache folder in the directory and
+        only files whose mtime/size (or contents) changed are parsed again.
+        progress(stage, done, total) is called as files are parsed; setting cancel_event
+        stops the load with ProcessingCancelled.
+        Throughput is recorded in self.load_stats.
         """
-        self.section_dfs = {}
+        if progress is not None:
+            progress('Listing files', None, None)
         self.group_dfs = {}
         self.run_dfs = {}
         
         # Include '.runthis' to catch files like "firstrun.runThis" (case-insensitive)
-        extensions = ('.run', '.grp', '.sec', '.runthis')
+        extensions = ('.run', '.grp', '.sec', '.runthis', BUNDLE_EXTENSION)
         
+        start_time = time.perf_counter()
+        section_paths = []
+        bundle_paths = []
+        section_sources = []  # .sec files and bundles in directory order
+        file_stats = {}
+        history_records = []
         for file in os.listdir(directory):
-            if file.lower().endswith(extensions):
+            list_type = list_file_type(file)
+            if list_type is not None:
+                try:
+                    history_records.append(parse_list_file(os.path.join(directory, file), list_type))
+                except Exception as e:
+                    print(f"Could not read {file}: {e}")
+                    raise
+            elif file.lower().endswith(extensions):
                 file_path = os.path.join(directory, file)
                 file_name, ext = os.path.splitext(file)
                 ext = ext.lower()
                 try:
+                    file_stats[file_path] = os.stat(file_path)
                     if ext == '.sec':
-                        # Process section file
-                        with open(file_path, 'r') as f:
-                            header = f.readline().strip()  # First line header
-                        header_parts = header.split()
-                        section_name = header_parts[0]
-                        # Extract credit hours if provided; default to 3.0 otherwise
-                        credit_hours = float(header_parts[1]) if len(header_parts) > 1 else 3.0
-                        self.section_credit_hours[section_name] = credit_hours
-                        
-                        df = pd.read_csv(file_path, sep=",", skiprows=1, header=None)
-                        df = df.applymap(lambda x: x.replace('"', '').strip() if isinstance(x, str) else x)
-                        df.columns = ["Name", "ID", "Grade"]
-                        df['Numeric Grade'] = df['Grade'].map(GRADE_MAP)
-                        self.section_dfs[section_name] = df
+                        # Section files are parsed below, possibly in parallel
+                        section_paths.append(file_path)
+                        section_sources.append(file_path)
+                    
+                    elif ext == BUNDLE_EXTENSION:
+                        # Bundles are split at their headers and parsed below
+                        bundle_paths.append(file_path)
+                        section_sources.append(file_path)
                     
                     elif ext == '.grp':
                         # Process group file
-                        with open(file_path, 'r') as f:
-                            group_name = f.readline().strip()  # First line is group name
-                            sections = [line.strip() for line in f if line.strip()]
-                        
-                        normalized_sections = [s.replace('.SEC', '').replace('.sec', '') for s in sections]
-                        df = pd.DataFrame({
-                            'Group Name': [group_name] * len(normalized_sections),
-                            'Section': normalized_sections
-                        })
-                        self.group_dfs[file_name] = df
+                        self.group_dfs[file_name] = parse_group_file(file_path)
                     
                     # Accept files that end with .run or .runthis
                     elif ext in ('.run', '.runthis'):
-                        with open(file_path, 'r') as f:
-                            semester = f.readline().strip()  # First line: semester info
-                            groups = [line.strip() for line in f if line.strip()]
-                        
-                        normalized_groups = [g.replace('.grp', '').replace('.GRP', '') for g in groups]
-                        df = pd.DataFrame({
-                            'Semester': [semester] * len(normalized_groups),
-                            'Group': normalized_groups
-                        })
-                        self.run_dfs[file_name] = df
+                        self.run_dfs[file_name] = parse_run_file(file_path)
                 except Exception as e:
                     print(f"Could not read {file}: {e}")
                     raise
         
+        # Reuse cached sections whose files are unchanged and parse the rest
+        cache_files, cache_rows = load_section_cache(directory) if use_cache else ({}, None)
+        reused = {}
+        cache_stale = len(cache_files) != len(section_paths)
+        for path in section_paths:
+            if not use_cache:
+                break
+            file = os.path.basename(path)
+            stat = file_stats[path]
+            entry = cache_files.get(file)
+            if entry is None or entry['size'] != stat.st_size:
+                cache_stale = True
+            elif entry['mtime_ns'] == stat.st_mtime_ns:
+                reused[path] = entry
+            elif entry['sha1'] == file_digest(path):
+                # Touched but not changed; keep the cached rows but record the new mtime
+                reused[path] = entry
+                cache_stale = True
+            else:
+                cache_stale = True
+        
+        to_parse = [path for path in section_paths if path not in reused]
+        parsed_by_path = dict(zip(to_parse, self._parse_sections(to_parse, workers, progress, cancel_event)))
+        if reused:
+            columns = {column: np.asarray(cache_rows[column].cat.categories, dtype=object)[cache_rows[column].cat.codes]
+                       for column in ('Name', 'ID', 'Grade')}
+            for path, entry in reused.items():
+                parsed_by_path[path] = cached_section(entry, columns)
+        if use_cache and cache_stale:
+            save_section_cache(directory, [(os.path.basename(path), file_stats[path], parsed_by_path[path])
+                                           for path in section_paths])
+        bundles = {path: self._parse_bundle(path, workers, progress, cancel_event) for path in bundle_paths}
+        parsed_by_source = {path: [parsed] for path, parsed in parsed_by_path.items()}
+        parsed_by_source.update(bundles)
+        parsed_sections = list(chain.from_iterable(parsed_by_source[path] for path in section_sources))
+        
+        # Merge the parsed results in directory order; a repeated section name replaces the earlier file
+        sections = {}
+        for parsed in parsed_sections:
+            sections[parsed['section']] = parsed
+            self.section_credit_hours[parsed['section']] = parsed['credit_hours']
+        if progress is not None:
+            progress('Building grade store', None, None)
+        self.grade_store, section_slices = build_grade_store(sections.values())
+        self.section_dfs = SectionView(self.grade_store, section_slices)
+        self.student_index = StudentIndex(self.grade_store)
+        self._clear_student_caches()
+        # Section aggregates do not depend on the selected run, so compute them once here
+        self.section_stats = build_section_stats(self.grade_store, self.section_credit_hours)
+        self.section_terms = parse_section_codes(self.section_stats.index)
+        self._all_group_members = self._build_group_members(self.group_dfs)
+        self.grade_cube = GradeCube(self.section_stats, self.section_terms, self._all_group_members)
+        
+        # Remember what was loaded so refresh_changed_files can pick up later edits
+        self.directory = directory
+        self.selected_run = None
+        self._file_signatures = {os.path.basename(path): (stat.st_mtime_ns, stat.st_size)
+                                 for path, stat in file_stats.items()}
+        self._section_files = {os.path.basename(path): [parsed['section'] for parsed in parsed_by_source[path]]
+                               for path in section_sources}
+        
+        elapsed = time.perf_counter() - start_time
+        if workers is None:
+            workers = os.cpu_count() or 1
+        self.load_stats = {
+            'files': len(self.section_dfs) + len(self.group_dfs) + len(self.run_dfs),
+            'section_files': len(section_paths),
+            'bundles': len(bundle_paths),
+            'bundle_sections': sum(len(records) for records in bundles.values()),
+            'parsed_files': len(to_parse),
+            'cached_files': len(reused),
+            'workers': workers if len(to_parse) >= PARALLEL_MIN_FILES else 1,
+            'seconds': elapsed,
+            'files_per_sec': len(section_paths) / elapsed if elapsed > 0 else 0.0
+        }
+        
         # Save original copies for future run filtering
         self.all_section_dfs = self.section_dfs.copy()
         self.all_group_dfs = self.group_dfs.copy()
         
+        if history_records:
+            self.history.add(pd.concat(history_records, ignore_index=True))
+            if self.history_path is not None:
+                self.history.save(self.history_path)
+        
         return len(self.section_dfs) + len(self.group_dfs) + len(self.run_dfs)
 
+    @staticmethod
+    def _parse_sections(section_paths, workers, progress=None, cancel_event=None):
+        """
+        Parse section files, fanning out over a process pool when asked to.
+        Results come back in the same order as section_paths.
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        chunksize = max(1, len(section_paths) // (workers * 4))
+        return GPAProcessor._run_parse_jobs(parse_section_file, section_paths, [1] * len(section_paths),
+                                            workers, chunksize, 'Parsing section files', progress, cancel_event)
+
+    @staticmethod
+    def _parse_bundle(bundle_path, workers, progress=None, cancel_event=None):
+        """
+        Split a section bundle at its header lines and parse the records in batches,
+        over a process pool when asked to. Returns the parsed sections in bundle order.
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        ranges = read_bundle_ranges(bundle_path)
+        batches = [ranges[i:i + BUNDLE_BATCH_SECTIONS] for i in range(0, len(ranges), BUNDLE_BATCH_SECTIONS)]
+        results = GPAProcessor._run_parse_jobs(
+            functools.partial(parse_bundle_records, bundle_path), batches, [len(batch) for batch in batches],
+            workers, 1, f'Parsing {os.path.basename(bundle_path)}', progress, cancel_event)
+        return list(chain.from_iterable(results))
+
+    @staticmethod
+    def _run_parse_jobs(function, jobs, job_sizes, workers, chunksize, stage, progress=None, cancel_event=None):
+        """
+        Call function on each job, in a process pool once there are PARALLEL_MIN_FILES
+        sections or more and workers > 1, so function must be picklable.
+        job_sizes counts the sections in each job for progress(stage, done, total).
+        Returns the job results in order; setting cancel_event raises ProcessingCancelled.
+        """
+        total = sum(job_sizes)
+        executor = None
+        if workers > 1 and total >= PARALLEL_MIN_FILES:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            results = executor.map(function, jobs, chunksize=chunksize)
+        else:
+            results = map(function, jobs)
+        
+        job_results = []
+        done = 0
+        reported = 0
+        try:
+            for result, size in zip(results, job_sizes):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ProcessingCancelled("Load cancelled")
+                job_results.append(result)
+                done += size
+                if progress is not None and (done - reported >= PROGRESS_INTERVAL or done == total):
+                    progress(stage, done, total)
+                    reported = done
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+        return job_results
+
+    @profiled('gpa', rows=lambda self: len(self.section_dfs))
     def calculate_all_gpas(self):
         """
         Calculate GPAs for all sections and groups.
         Section GPA remains as the simple mean (since all students in a section have the same credit hours).
         Group GPA is now calculated as a weighted average based on credit hours.
         """
-        # Calculate section GPAs (simple average per section)
-        for section_name, df in self.section_dfs.items():
-            valid_grades = df[df['Numeric Grade'].notna()]
-            if not valid_grades.empty:
-                self.section_gpas[section_name] = valid_grades['Numeric Grade'].mean()
-            else:
-                self.section_gpas[section_name] = None
-        
-        # Calculate group GPAs using weighted averages
-        for group_name, df in self.group_dfs.items():
-            sections = df['Section'].tolist()
-            total_points = 0.0
-            total_credits = 0.0
-            for section in sections:
-                if section in self.section_dfs:
-                    df_section = self.section_dfs[section]
-                    credit_hours = self.section_credit_hours.get(section, 3.0)
-                    valid = df_section[df_section['Numeric Grade'].notna()]
-                    if not valid.empty:
-                        total_points += valid['Numeric Grade'].sum() * credit_hours
-                        total_credits += len(valid) * credit_hours
-            self.group_gpas[group_name] = total_points / total_credits if total_credits > 0 else None
+        self._update_section_gpas(self.section_dfs.keys())
+        self._update_group_gpas(self.group_dfs.keys())
                         
         # Calculate z-scores after GPAs are calculated
         self.calculate_z_scores()
         
         return self.section_gpas, self.group_gpas
 
+    def _update_section_gpas(self, section_names):
+        """
+        Set GPAs for the given sections from the per-section statistics cached at load time.
+        """
+        stats = self.section_stats.reindex(list(section_names))
+        section_gpas = stats['points'] / stats['graded'].where(stats['graded'] > 0)
+        self.section_gpas.update({name: (None if pd.isna(gpa) else gpa)
+                                  for name, gpa in section_gpas.items()})
+
+    def _update_group_gpas(self, group_names):
+        """
+        Recalculate the given groups' GPAs as credit-hour weighted averages of their selected sections.
+        """
+        group_names = list(group_names)
+        stats = self._active_section_stats()
+        weighted = pd.DataFrame({
+            'points': stats['points'] * stats['credit_hours'],
+            'credits': stats['graded'] * stats['credit_hours']
+        })
+        members = self._group_members()
+        members = members[members['Group Key'].isin(group_names)].join(weighted, on='Section')
+        group_totals = members.groupby('Group Key', sort=False)[['points', 'credits']].sum()
+        for group_name in group_names:
+            if group_name in group_totals.index and group_totals.at[group_name, 'credits'] > 0:
+                self.group_gpas[group_name] = group_totals.at[group_name, 'points'] / group_totals.at[group_name, 'credits']
+            else:
+                self.group_gpas[group_name] = None
+
+    def _active_enrollments(self):
+        """
+        Rows of the grade store that belong to the currently selected sections.
+        """
+        sections = self.grade_store['Section']
+        active = sections.cat.categories.isin(list(self.section_dfs.keys()))
+        return self.grade_store[active[sections.cat.codes.to_numpy()]]
+
+    def _list_candidates(self):
+        """
+        Rows, across every loaded section, that may put a student on a good or work list:
+        Section and ID categoricals and Numeric Grade. All rows here; see ChunkedGPAProcessor.
+        """
+        return self.grade_store
+
+    def _active_student_ids(self):
+        """
+        Unique IDs of the students enrolled in the currently selected sections.
+        """
+        return self._active_enrollments()['ID'].unique()
+
+    def _active_section_stats(self):
+        """
+        Cached per-section statistics for the currently selected sections, in load order.
+        """
+        return self.section_stats.reindex(list(self.section_dfs.keys()))
+
+    @staticmethod
+    def _build_group_members(group_dfs):
+        """
+        One row per (group, section) pair for the given groups.
+        """
+        if not group_dfs:
+            return pd.DataFrame({'Group Key': pd.Series(dtype=object), 'Section': pd.Series(dtype=object)})
+        return pd.concat([pd.DataFrame({'Group Key': group_name, 'Section': df['Section']})
+                          for group_name, df in group_dfs.items()], ignore_index=True)
+
+    def _group_members(self):
+        """
+        One row per (group, section) pair for the currently selected groups.
+        """
+        members = self._all_group_members
+        return members[members['Group Key'].isin(list(self.group_dfs.keys()))]
+
+    @profiled('z-score', rows=lambda self: len(self.section_dfs) + len(self.group_dfs))
     def calculate_z_scores(self):
         """
         Calculate z-scores for sections and groups based on their GPAs.
         Z-score represents how many standard deviations a GPA is from the mean.
         """
-        # Calculate z-scores for sections
-        # Only consider sections that are currently in section_dfs (after filtering)
-        filtered_section_gpas = [self.section_gpas[name] for name in self.section_dfs.keys() 
-                               if name in self.section_gpas and self.section_gpas[name] is not None]
+        # Only consider sections and groups that are currently selected (after filtering)
+        self.section_z_scores = compute_z_scores(
+            pd.Series([self.section_gpas.get(name) for name in self.section_dfs.keys()],
+                      index=list(self.section_dfs.keys()), dtype=object))
+        self.group_z_scores = compute_z_scores(
+            pd.Series([self.group_gpas.get(name) for name in self.group_dfs.keys()],
+                      index=list(self.group_dfs.keys()), dtype=object))
+
+    @profiled('lists', rows=lambda self: len(self.good_list) + len(self.work_list))
+    def populate_good_work_lists(self):
+        """
+        Create lists of students with A grades (Good List) and D/F grades (Work List).
+        """
+        self.good_list = self.build_student_list(min_grade=GOOD_LIST_MIN_GRADE)
+        self.work_list = self.build_student_list(max_grade=WORK_LIST_MAX_GRADE)
+        self._table_cache = {}
+        return self.good_list, self.work_list
+
+    def build_student_list(self, min_grade=None, max_grade=None, sections=None):
+        """
+        Find students with at least one grade between min_grade and max_grade (inclusive,
+        compared by grade points) in the selected sections, e.g. min_grade='B+' for honours.
+        Pass sections to look only at some of the selected sections.
+        Returns a StudentList of student ID -> {'name': ..., 'classes': [section names]}.
+        """
+        enrollments = self._active_enrollments()
+        if sections is not None:
+            enrollments = enrollments[enrollments['Section'].isin(list(sections))]
+        numeric = enrollments['Numeric Grade']
+        mask = numeric.notna()
+        if min_grade is not None:
+            mask &= numeric >= GRADE_MAP[min_grade]
+        if max_grade is not None:
+            mask &= numeric <= GRADE_MAP[max_grade]
+        
+        matches = enrollments[mask]
+        if matches.empty:
+            return StudentList.empty()
+        
+        # Codes point into the grade store's string tables, so the list shares its strings
+        return StudentList.from_rows(
+            matches['ID'].cat.categories, matches['Name'].cat.categories, matches['Section'].cat.categories,
+            matches['ID'].cat.codes.to_numpy(), matches['Name'].cat.codes.to_numpy(),
+            matches['Section'].cat.codes.to_numpy())
+
+    def scan_for_changes(self):
+        """
+        Compare the loaded directory with the file signatures recorded at the last load or refresh.
+        Returns (added, modified, deleted) lists of file names.
+        """
+        if self.directory is None:
+            return [], [], []
+        extensions = ('.run', '.grp', '.sec', '.runthis', BUNDLE_EXTENSION)
+        current = {}
+        for file in os.listdir(self.directory):
+            if file.lower().endswith(extensions):
+                try:
+                    stat = os.stat(os.path.join(self.directory, file))
+                except FileNotFoundError:
+                    continue  # Deleted while scanning; picked up on the next scan
+                current[file] = (stat.st_mtime_ns, stat.st_size)
+        added = [file for file in current if file not in self._file_signatures]
+        modified = [file for file in current
+                    if file in self._file_signatures and current[file] != self._file_signatures[file]]
+        deleted = [file for file in self._file_signatures if file not in current]
+        return added, modified, deleted
+
+    @profiled('refresh')
+    def refresh_changed_files(self):
+        """
+        Re-ingest only the files added, modified or deleted since the last load or refresh.
+        Changed sections are replaced in the grade store, then their GPAs, the groups that
+        contain them, the z-scores and the good/work lists are updated from the delta.
+        A changed .grp or .run file changes group membership, so groups and lists are recomputed.
+        Returns the (added, modified, deleted) file names.
+        """
+        added, modified, deleted = self.scan_for_changes()
+        if not (added or modified or deleted):
+            return added, modified, deleted
         
-        # Reset section z-scores dictionary
-        self.section_z_scores = {}
+        def is_section(file):
+            return file.lower().endswith(('.sec', BUNDLE_EXTENSION))
         
-        if filtered_section_gpas:
-            if len(filtered_section_gpas) == 1:
-                # If there's only one section, z-score is 0
-                for name in self.section_dfs.keys():
-                    if name in self.section_gpas and self.section_gpas[name] is not None:
-                        self.section_z_scores[name] = 0.0
+        # Sections whose rows may change: those held by edited, removed or new files
+        affected = set(chain.from_iterable(self._section_files.pop(file) for file in modified + deleted
+                                           if file in self._section_files))
+        new_files = [file for file in added + modified if is_section(file)]
+        sec_files = [file for file in new_files if file.lower().endswith('.sec')]
+        parsed_by_file = {file: [parsed] for file, parsed in zip(
+            sec_files, self._parse_sections([os.path.join(self.directory, file) for file in sec_files], 1))}
+        for file in new_files:
+            if file not in parsed_by_file:
+                parsed_by_file[file] = self._parse_bundle(os.path.join(self.directory, file), 1)
+            self._section_files[file] = [parsed['section'] for parsed in parsed_by_file[file]]
+            affected.update(self._section_files[file])
+        
+        # Keep the sources in directory order, so a repeated section name resolves as in a fresh load
+        order = {file: position for position, file in enumerate(os.listdir(self.directory))}
+        self._section_files = dict(sorted(self._section_files.items(),
+                                          key=lambda item: order.get(item[0], len(order))))
+        winners = {}  # Section name -> (file, record position) of the last source holding it
+        for file, section_names in self._section_files.items():
+            for position, section_name in enumerate(section_names):
+                if section_name in affected:
+                    winners[section_name] = (file, position)
+        
+        # Take each winning record from the new parse, or re-read it from its unchanged source
+        wanted = {}
+        for file, position in winners.values():
+            wanted.setdefault(file, []).append(position)
+        parsed_sections = []
+        for file, positions in wanted.items():
+            file_path = os.path.join(self.directory, file)
+            if file in parsed_by_file:
+                parsed_sections.extend(parsed_by_file[file][position] for position in positions)
+            elif file.lower().endswith('.sec'):
+                parsed_sections.append(parse_section_file(file_path))
             else:
-                # Normal z-score calculation for multiple sections
-                mean = sum(filtered_section_gpas) / len(filtered_section_gpas)
-                std_dev = (sum((x - mean) ** 2 for x in filtered_section_gpas) / len(filtered_section_gpas)) ** 0.5
-                
-                if std_dev > 0:  # Avoid division by zero
-                    for name in self.section_dfs.keys():
-                        if name in self.section_gpas and self.section_gpas[name] is not None:
-                            self.section_z_scores[name] = (self.section_gpas[name] - mean) / std_dev
-                else:
-                    # If all GPAs are the same, z-score is 0
-                    for name in self.section_dfs.keys():
-                        if name in self.section_gpas and self.section_gpas[name] is not None:
-                            self.section_z_scores[name] = 0.0
-        
-        # Calculate z-scores for groups (keeping the fixed code we already provided)
-        # Only consider groups that are currently in group_dfs (after filtering)
-        filtered_group_gpas = [self.group_gpas[name] for name in self.group_dfs.keys() 
-                              if name in self.group_gpas and self.group_gpas[name] is not None]
-        
-        # Reset group z-scores dictionary
-        self.group_z_scores = {}
-        
-        if filtered_group_gpas:
-            if len(filtered_group_gpas) == 1:
-                # If there's only one group, z-score is 0
-                for name in self.group_dfs.keys():
-                    if name in self.group_gpas and self.group_gpas[name] is not None:
-                        self.group_z_scores[name] = 0.0
+                ranges = read_bundle_ranges(file_path)
+                parsed_sections.extend(parse_bundle_records(file_path, [ranges[position] for position in positions]))
+        removed_sections = affected - winners.keys()
+        for section_name in removed_sections:
+            self.section_credit_hours.pop(section_name, None)
+        for parsed in parsed_sections:
+            self.section_credit_hours[parsed['section']] = parsed['credit_hours']
+        if affected:
+            self._replace_sections(removed_sections, parsed_sections,
+                                   list(dict.fromkeys(chain.from_iterable(self._section_files.values()))))
+        
+        # Group and run files are tiny, so just re-read the ones that changed
+        layout_changed = False
+        for file in added + modified + deleted:
+            if is_section(file):
+                continue
+            layout_changed = True
+            file_name, ext = os.path.splitext(file)
+            target = self.all_group_dfs if ext.lower() == '.grp' else self.run_dfs
+            if file in deleted:
+                target.pop(file_name, None)
+            elif ext.lower() == '.grp':
+                target[file_name] = parse_group_file(os.path.join(self.directory, file))
             else:
-                # Normal z-score calculation for multiple groups
-                mean = sum(filtered_group_gpas) / len(filtered_group_gpas)
-                std_dev = (sum((x - mean) ** 2 for x in filtered_group_gpas) / len(filtered_group_gpas)) ** 0.5
-                
-                if std_dev > 0:  # Avoid division by zero
-                    for name in self.group_dfs.keys():
-                        if name in self.group_gpas and self.group_gpas[name] is not None:
-                            self.group_z_scores[name] = (self.group_gpas[name] - mean) / std_dev
-                else:
-                    # If all GPAs are the same, z-score is 0
-                    for name in self.group_dfs.keys():
-                        if name in self.group_gpas and self.group_gpas[name] is not None:
-                            self.group_z_scores[name] = 0.0
+                target[file_name] = parse_run_file(os.path.join(self.directory, file))
+        if layout_changed:
+            self._all_group_members = self._build_group_members(self.all_group_dfs)
+        if layout_changed or affected:
+            self.grade_cube = GradeCube(self.section_stats, self.section_terms, self._all_group_members)
+        
+        for file in deleted:
+            self._file_signatures.pop(file, None)
+        for file in added + modified:
+            stat = os.stat(os.path.join(self.directory, file))
+            self._file_signatures[file] = (stat.st_mtime_ns, stat.st_size)
+        
+        # Re-apply the current selection over the updated data
+        if self.selected_run in self.run_dfs:
+            self.select_run(self.selected_run)
+        else:
+            self.reset_to_all_data()
+        
+        if layout_changed:
+            self.calculate_all_gpas()
+            self.populate_good_work_lists()
+            return added, modified, deleted
+        
+        # Push the section delta through GPAs, affected groups, z-scores and lists
+        for section_name in affected - set(self.section_dfs.keys()):
+            self.section_gpas.pop(section_name, None)
+        self._update_section_gpas([name for name in affected if name in self.section_dfs])
+        members = self._group_members()
+        self._update_group_gpas(members.loc[members['Section'].isin(list(affected)), 'Group Key'].unique())
+        self.calculate_z_scores()
+        self.good_list = self._merge_student_list(
+            self.good_list, affected, self.build_student_list(min_grade=GOOD_LIST_MIN_GRADE, sections=affected))
+        self.work_list = self._merge_student_list(
+            self.work_list, affected, self.build_student_list(max_grade=WORK_LIST_MAX_GRADE, sections=affected))
+        self._table_cache = {}
+        return added, modified, deleted
 
-    def populate_good_work_lists(self):
+    def watch(self, interval=2.0, callback=None, stop_event=None):
         """
-        Create lists of students with A grades (Good List) and D/F grades (Work List).
+        Poll the loaded directory every interval seconds and refresh changed files until
+        stop_event is set. callback(added, modified, deleted) is called after each refresh
+        that found changes. Blocks, so run it in a thread when needed.
         """
-        self.good_list = {}
-        self.work_list = {}
-        
-        for section_name, df in self.section_dfs.items():
-            for _, student in df.iterrows():
-                name, student_id, grade = student['Name'], student['ID'], student['Grade']
-                if grade == 'A':   
-                    if student_id in self.good_list:
-                        self.good_list[student_id]['classes'].append(section_name)
-                    else:
-                        self.good_list[student_id] = {'name': name, 'classes': [section_name]}
-                elif grade in ['F', 'D+', 'D', 'D-']:
-                    if student_id in self.work_list:
-                        self.work_list[student_id]['classes'].append(section_name)
-                    else:
-                        self.work_list[student_id] = {'name': name, 'classes': [section_name]}
-        return self.good_list, self.work_list
+        if stop_event is None:
+            stop_event = threading.Event()
+        while not stop_event.wait(interval):
+            changes = self.refresh_changed_files()
+            if any(changes) and callback is not None:
+                callback(*changes)
+
+    def _replace_sections(self, removed_sections, parsed_sections, section_order):
+        """
+        Drop the rows of removed_sections and of every re-parsed section from the grade store,
+        add the parsed sections, and update the cached per-section statistics to match.
+        section_order lists every loaded section in load order; the store is laid out in it,
+        so sections keep the places a fresh load of the directory gives them.
+        """
+        replaced = set(removed_sections) | {parsed['section'] for parsed in parsed_sections}
+        old_slices = self.all_section_dfs.slices
+        keep = ~self.grade_store['Section'].isin(list(replaced)).to_numpy()
+        new_store, new_slices = build_grade_store(parsed_sections)
+        merged = merge_grade_stores(self.grade_store[keep], new_store)
+        
+        # Kept sections stay contiguous and in order, so their slices just shift up; new ones follow
+        merged_slices = {}
+        start = 0
+        for section_name, (old_start, old_stop) in old_slices.items():
+            if section_name not in replaced:
+                merged_slices[section_name] = (start, start + old_stop - old_start)
+                start += old_stop - old_start
+        for section_name, (new_start, new_stop) in new_slices.items():
+            merged_slices[section_name] = (start + new_start, start + new_stop)
+        
+        # Move each section's rows to its place in load order
+        order = [section_name for section_name in section_order if section_name in merged_slices]
+        bounds = np.array([merged_slices[section_name] for section_name in order], dtype=np.int64).reshape(-1, 2)
+        lengths = bounds[:, 1] - bounds[:, 0]
+        stops = np.cumsum(lengths)
+        rows = np.arange(len(merged)) + np.repeat(bounds[:, 0] - (stops - lengths), lengths)
+        if not np.array_equal(rows, np.arange(len(merged))):
+            merged = merged.iloc[rows].reset_index(drop=True)
+        merged['Section'] = merged['Section'].cat.set_categories(order)
+        self.grade_store = merged
+        slices = {section_name: (int(stop - length), int(stop))
+                  for section_name, length, stop in zip(order, lengths, stops)}
+        
+        self.all_section_dfs = SectionView(self.grade_store, slices)
+        self.section_dfs = self.all_section_dfs.subset(self.section_dfs.keys() | new_slices.keys())
+        self.student_index = StudentIndex(self.grade_store)
+        self._clear_student_caches()
+        self.section_stats = pd.concat([
+            self.section_stats.drop(index=list(replaced), errors='ignore'),
+            build_section_stats(new_store, self.section_credit_hours)
+        ]).reindex(order)
+        self.section_terms = parse_section_codes(self.section_stats.index)
+
+    @staticmethod
+    def _merge_student_list(student_list, changed_sections, additions):
+        """
+        Remove changed_sections from a good/work list and merge in the entries rebuilt for them.
+        Students keep their place and name; rebuilt classes follow their remaining ones.
+        """
+        ids, names, sections = student_list.rows()
+        keep = ~pd.Series(sections, dtype=object).isin(list(changed_sections)).to_numpy()
+        added_ids, added_names, added_sections = additions.rows()
+        return StudentList.from_records(np.concatenate([ids[keep], added_ids]),
+                                        np.concatenate([names[keep], added_names]),
+                                        np.concatenate([sections[keep], added_sections]))
 
     def get_grade_distribution(self, section_name):
         """
@@ -244,39 +1502,46 @@ class GPAProcessor:
         """
         if section_name not in self.section_dfs:
             return None
-        df = self.section_dfs[section_name]
-        grade_counts = df['Grade'].value_counts()
-        distribution = {
-            'A': grade_counts.get('A', 0),
-            'A-': grade_counts.get('A-', 0),
-            'B+': grade_counts.get('B+', 0),
-            'B': grade_counts.get('B', 0),
-            'B-': grade_counts.get('B-', 0),
-            'C+': grade_counts.get('C+', 0),
-            'C': grade_counts.get('C', 0),
-            'C-': grade_counts.get('C-', 0),
-            'D+': grade_counts.get('D+', 0),
-            'D': grade_counts.get('D', 0),
-            'D-': grade_counts.get('D-', 0),
-            'F': grade_counts.get('F', 0)
-        }
-        return distribution
+        # Counts were tallied once per load in section_stats
+        counts = self.section_stats.loc[section_name, DISTRIBUTION_GRADES].tolist()
+        return dict(zip(DISTRIBUTION_GRADES, map(int, counts)))
+
+    def get_grade_histograms(self, section_names=None):
+        """
+        Grade counts as a sections x DISTRIBUTION_GRADES integer DataFrame, for the selected
+        sections in load order unless section_names is given. The counts are tallied at
+        load time and kept up to date by refresh_changed_files, so this is a single lookup.
+        """
+        if section_names is None:
+            section_names = self.section_dfs.keys()
+        histograms = self.section_stats.reindex(list(section_names))[DISTRIBUTION_GRADES]
+        return histograms.fillna(0).astype(np.int64)
+
+    def get_section_table(self):
+        """
+        The selected sections as a table: Section Name, GPA, Z-Score and a count column per
+        grade in DISTRIBUTION_GRADES, in load order. GPA and Z-Score are NaN when missing.
+        """
+        section_names = list(self.section_dfs.keys())
+        table = self.get_grade_histograms(section_names).reset_index(drop=True)
+        table.insert(0, 'Section Name', section_names)
+        table.insert(1, 'GPA', np.array([self.section_gpas.get(name) for name in section_names], dtype=np.float64))
+        table.insert(2, 'Z-Score', np.array([self.section_z_scores.get(name) for name in section_names],
+                                            dtype=np.float64))
+        return table
 
     def get_all_sections_data(self):
         """
         Get data for all sections for display.
         """
-        sections_data = []
-        for section_name, df in self.section_dfs.items():
-            distribution = self.get_grade_distribution(section_name)
-            section_data = {
-                'name': section_name,
-                'gpa': self.section_gpas.get(section_name),
-                'z_score': self.section_z_scores.get(section_name),
-                'distribution': distribution
-            }
-            sections_data.append(section_data)
-        return sections_data
+        section_names = list(self.section_dfs.keys())
+        counts = self.get_grade_histograms(section_names).to_numpy().tolist()
+        return [{
+            'name': section_name,
+            'gpa': self.section_gpas.get(section_name),
+            'z_score': self.section_z_scores.get(section_name),
+            'distribution': dict(zip(DISTRIBUTION_GRADES, section_counts))
+        } for section_name, section_counts in zip(section_names, counts)]
 
     def get_all_groups_data(self):
         """
@@ -294,18 +1559,29 @@ class GPAProcessor:
             groups_data.append(group_data)
         return groups_data
 
+    def get_group_table(self):
+        """
+        The selected groups as a table with Group Name, GPA, Z-Score and Sections (comma
+        separated) columns; GPA and Z-Score are NaN where a group has none.
+        """
+        names = [df['Group Name'].iloc[0] if 'Group Name' in df.columns else group_name
+                 for group_name, df in self.group_dfs.items()]
+        gpas = [self.group_gpas.get(group_name) for group_name in self.group_dfs]
+        z_scores = [self.group_z_scores.get(group_name) for group_name in self.group_dfs]
+        return pd.DataFrame({
+            'Group Name': names,
+            'GPA': np.array([np.nan if gpa is None else gpa for gpa in gpas], dtype=np.float64),
+            'Z-Score': np.array([np.nan if z is None else z for z in z_scores], dtype=np.float64),
+            'Sections': [', '.join(df['Section'].tolist()) for df in self.group_dfs.values()]
+        }, columns=['Group Name', 'GPA', 'Z-Score', 'Sections'])
+
     def get_overall_gpa(self):
         """
         Calculate the overall GPA across all sections using weighted averages.
         """
-        total_points = 0.0
-        total_credits = 0.0
-        for section_name, df in self.section_dfs.items():
-            credit_hours = self.section_credit_hours.get(section_name, 3.0)
-            valid = df[df['Numeric Grade'].notna()]
-            if not valid.empty:
-                total_points += valid['Numeric Grade'].sum() * credit_hours
-                total_credits += len(valid) * credit_hours
+        stats = self._active_section_stats()
+        total_credits = (stats['graded'] * stats['credit_hours']).sum()
+        total_points = (stats['points'] * stats['credit_hours']).sum()
         return total_points / total_credits if total_credits > 0 else None
 
     def get_summary_statistics(self):
@@ -314,10 +1590,7 @@ class GPAProcessor:
         """
         section_count = len(self.section_dfs)
         group_count = len(self.group_dfs)
-        student_ids = set()
-        for df in self.section_dfs.values():
-            student_ids.update(df['ID'].unique())
-        student_count = len(student_ids)
+        student_count = len(self._active_student_ids())
         return {
             'section_count': section_count,
             'group_count': group_count,
@@ -327,6 +1600,7 @@ class GPAProcessor:
             'overall_gpa': self.get_overall_gpa()
         }
 
+    @profiled('select run', rows=lambda self: len(self.section_dfs))
     def select_run(self, run_file_name):
         """
         Filter group and section data based on the selected run file.
@@ -344,75 +1618,334 @@ class GPAProcessor:
         valid_sections = set()
         for df in self.group_dfs.values():
             valid_sections.update(df['Section'].tolist())
-        self.section_dfs = {sec: df for sec, df in self.all_section_dfs.items() if sec in valid_sections}
+        self.section_dfs = self.all_section_dfs.subset(valid_sections)
+        self.selected_run = run_file_name
+        self._clear_student_caches()
 
-    def export_section_data(self, filepath):
-        """Export section data to a CSV file"""
-        if not self.section_dfs:
+    @profiled('all runs', rows=lambda self: len(self.run_dfs))
+    def evaluate_all_runs(self, run_names=None):
+        """
+        Evaluate every run file (or just run_names) in one pass, leaving the selection alone.
+        Section and group aggregates are worked out once and shared between runs: a run
+        selects all of a group's sections, so a group's GPA is the same in every run that
+        includes it. Only the z-scores and list counts depend on the run.
+        Returns a dictionary of DataFrames indexed by run name:
+          'gpa', 'z_score', 'good_list', 'work_list': run x group matrices, missing where a
+              run leaves the group out. A group's list counts are the students its sections
+              put on that list.
+          'summary': section_count, group_count, good_list_count, work_list_count and
+              overall_gpa per run, as get_summary_statistics reports them after select_run.
+        """
+        run_names = list(self.run_dfs) if run_names is None else list(run_names)
+        for run_name in run_names:
+            if run_name not in self.run_dfs:
+                raise ValueError(f"Run file '{run_name}' not found.")
+        group_keys = list(self.all_group_dfs)
+        group_names = [df['Group Name'].iloc[0] for df in self.all_group_dfs.values()]
+        stats = self.section_stats
+        section_names = stats.index
+        
+        # Group membership as (group position, section position) pairs over the loaded sections
+        members = self._all_group_members
+        member_groups = pd.Index(group_keys).get_indexer(members['Group Key'])
+        member_sections = section_names.get_indexer(members['Section'])
+        known = (member_groups >= 0) & (member_sections >= 0)
+        member_groups, member_sections = member_groups[known], member_sections[known]
+        
+        # Group GPAs once, as _update_group_gpas computes them
+        weighted_points = (stats['points'] * stats['credit_hours']).to_numpy(np.float64)
+        weighted_credits = (stats['graded'] * stats['credit_hours']).to_numpy(np.float64)
+        points = np.bincount(member_groups, weights=weighted_points[member_sections], minlength=len(group_keys))
+        credits = np.bincount(member_groups, weights=weighted_credits[member_sections], minlength=len(group_keys))
+        group_gpas = np.divide(points, credits, out=np.full(len(group_keys), np.nan), where=credits > 0)
+        
+        # Which groups and sections each run selects
+        in_run = np.zeros((len(run_names), len(group_keys)), dtype=bool)
+        active = np.zeros((len(run_names), len(section_names)), dtype=bool)
+        for i, run_name in enumerate(run_names):
+            in_run[i] = np.isin(group_names, self.run_dfs[run_name]['Group'].tolist())
+            active[i, member_sections[in_run[i][member_groups]]] = True
+        
+        gpa = np.where(in_run, group_gpas, np.nan)
+        z_score = np.full(gpa.shape, np.nan)
+        for i in range(len(run_names)):
+            selected = np.flatnonzero(in_run[i])
+            z_scores = compute_z_scores(pd.Series(gpa[i, selected], index=selected))
+            z_score[i, list(z_scores)] = list(z_scores.values())
+        
+        total_points = active @ weighted_points
+        total_credits = active @ weighted_credits
+        summary = {
+            'section_count': active.sum(axis=1),
+            'group_count': in_run.sum(axis=1),
+            'overall_gpa': np.divide(total_points, total_credits, out=np.full(len(run_names), np.nan),
+                                     where=total_credits > 0)
+        }
+        
+        # A student is counted once per list in each run and each group, whatever their number of rows
+        rows = self._list_candidates()
+        row_sections = section_names.get_indexer(rows['Section'].cat.categories)[rows['Section'].cat.codes.to_numpy()]
+        row_students = rows['ID'].cat.codes.to_numpy()
+        student_count = len(rows['ID'].cat.categories)
+        numeric = rows['Numeric Grade'].to_numpy()
+        links = pd.DataFrame({'group': member_groups, 'section': member_sections}).drop_duplicates()
+        list_counts = {}
+        for list_name, qualifies in (('good_list', numeric >= GRADE_MAP[GOOD_LIST_MIN_GRADE]),
+                                     ('work_list', numeric <= GRADE_MAP[WORK_LIST_MAX_GRADE])):
+            pairs = pd.DataFrame({'section': row_sections[qualifies], 'student': row_students[qualifies]})
+            pairs = pairs[pairs['section'] >= 0].drop_duplicates()
+            per_group = (links.merge(pairs, on='section').drop_duplicates(['group', 'student'])
+                         .groupby('group').size().reindex(range(len(group_keys)), fill_value=0).to_numpy())
+            list_counts[list_name] = np.where(in_run, per_group, np.nan)
+            pair_sections, pair_students = pairs['section'].to_numpy(), pairs['student'].to_numpy()
+            summary[f'{list_name}_count'] = np.array([
+                np.count_nonzero(np.bincount(pair_students[active[i, pair_sections]], minlength=student_count))
+                for i in range(len(run_names))], dtype=np.int64)
+        
+        index = pd.Index(run_names, name='Run')
+        return {
+            'gpa': pd.DataFrame(gpa, index=index, columns=group_keys),
+            'z_score': pd.DataFrame(z_score, index=index, columns=group_keys),
+            'good_list': pd.DataFrame(list_counts['good_list'], index=index, columns=group_keys).astype('Int64'),
+            'work_list': pd.DataFrame(list_counts['work_list'], index=index, columns=group_keys).astype('Int64'),
+            'summary': pd.DataFrame(summary, index=index)[['section_count', 'group_count', 'good_list_count',
+                                                           'work_list_count', 'overall_gpa']]
+        }
+
+    def get_terms(self):
+        """Every term found in the loaded section codes, oldest first."""
+        return self.section_terms['Term'].cat.categories.tolist()
+
+    def _course_term_totals(self, courses=None):
+        """
+        Credit-weighted points and credits per (course, term) over every loaded section,
+        whatever run is selected, sorted by course then term. Sections without a term are left out.
+        """
+        stats = self.section_stats
+        terms = self.section_terms
+        frame = pd.DataFrame({
+            'Course': terms['Course'],
+            'Term': terms['Term'],
+            'graded': stats['graded'],
+            'points': stats['points'] * stats['credit_hours'],
+            'credits': stats['graded'] * stats['credit_hours']
+        }, index=stats.index)
+        frame = frame[frame['Term'].notna()]
+        if courses is not None:
+            frame = frame[frame['Course'].isin(list(courses))]
+        totals = frame.groupby(['Course', 'Term'], observed=True, sort=True).agg(
+            Sections=('graded', 'size'), Graded=('graded', 'sum'),
+            points=('points', 'sum'), credits=('credits', 'sum'))
+        totals['GPA'] = totals['points'] / totals['credits'].where(totals['credits'] > 0)
+        return totals
+
+    def get_course_gpa_by_term(self, courses=None):
+        """
+        Course x term table of credit-weighted GPAs across all of a course's sections in
+        each term, with terms in order and missing where the course did not run.
+        """
+        gpas = self._course_term_totals(courses)['GPA'].unstack('Term')
+        return gpas.reindex(columns=self.section_terms['Term'].cat.categories)
+
+    def get_course_trends(self, window=3, courses=None):
+        """
+        One row per course and term the course ran in, oldest term first within each course:
+        Course, Term, Sections, Graded, GPA, Rolling GPA (credit-weighted over the course's
+        last window terms) and Change (GPA minus the GPA of the course's previous term).
+        """
+        totals = self._course_term_totals(courses)
+        by_course = totals.groupby(level='Course', observed=True, sort=False)
+        # Window sums as running totals minus the running totals window terms back
+        running = by_course[['points', 'credits']].cumsum()
+        rolling = running - running.groupby(level='Course', observed=True, sort=False).shift(window, fill_value=0)
+        totals['Rolling GPA'] = rolling['points'] / rolling['credits'].where(rolling['credits'] > 0)
+        totals['Change'] = by_course['GPA'].diff()
+        return totals.reset_index()[['Course', 'Term', 'Sections', 'Graded', 'GPA', 'Rolling GPA', 'Change']]
+
+    def get_export_tables(self, names=None):
+        """
+        The tables the exports write, keyed by name from EXPORT_NAMES (all of them unless
+        names is given), taken from the current selection; None where there is nothing to
+        export. The tables are separate from processor state, so they can be written on
+        other threads while the processor moves on.
+        """
+        names = EXPORT_NAMES if names is None else names
+        tables = {}
+        for name in names:
+            if name == 'section_data':
+                tables[name] = self.get_section_table() if self.section_dfs else None
+            elif name == 'group_data':
+                tables[name] = self.get_group_table() if self.group_dfs else None
+            elif name in ('good_list', 'work_list'):
+                student_list = self.good_list if name == 'good_list' else self.work_list
+                tables[name] = pd.DataFrame({
+                    'Student Name': student_list.student_names(),
+                    'Student ID': student_list.student_ids(),
+                    'Classes': student_list.joined_classes()
+                }) if student_list else None
+            elif name == 'history':
+                patterns = self._history_patterns()
+                flags = {'Good List Multiple Times': 'repeat_good', 'Work List Multiple Times': 'repeat_work',
+                         'Both Lists': 'mixed'}
+                tables[name] = pd.DataFrame({
+                    'Student Name': patterns['Student Name'],
+                    'Student ID': patterns['ID'],
+                    **{column: np.where(patterns[key], 'Yes', 'No') for column, key in flags.items()}
+                }) if len(patterns) else None
+            else:
+                raise ValueError(f"Unknown export '{name}'.")
+        return tables
+
+    def export_all(self, output_dir, file_format='csv', names=None):
+        """
+        Write every export (or just names) for the current selection into output_dir at once,
+        one worker thread per file, in any format from exportEngine.EXPORT_FORMATS.
+        Returns {name: path}, with None for exports that had nothing to write.
+        """
+        tables = self.get_export_tables(names)
+        paths = write_tables({name: table for name, table in tables.items() if table is not None},
+                             output_dir, file_format)
+        return {name: paths.get(name) for name in tables}
+
+    def _export(self, name, filepath):
+        table = self.get_export_tables([name])[name]
+        if table is None:
             return False
-            
-        # Create a DataFrame with all section data for export
-        export_data = []
-        for section_name, df in self.section_dfs.items():
-            distribution = self.get_grade_distribution(section_name)
-            gpa = self.section_gpas.get(section_name)
-            z_score = self.section_z_scores.get(section_name)
-            row = {
-                'Section Name': section_name,
-                'GPA': gpa if gpa is not None else 'N/A',
-                'Z-Score': z_score if z_score is not None else 'N/A'
-            }
-            # Add grade distribution
-            for grade, count in distribution.items():
-                row[grade] = count
-                
-            export_data.append(row)
-        
-        # Convert to DataFrame and export
-        export_df = pd.DataFrame(export_data)
-        export_df.to_csv(filepath, index=False)
+        write_table(table, filepath)
         return True
 
+    def export_section_data(self, filepath):
+        """Export section data to a CSV file (gzipped or .npz by extension, see exportEngine)"""
+        return self._export('section_data', filepath)
+
     def export_group_data(self, filepath):
         """Export group data to a CSV file"""
-        if not self.group_dfs:
-            return False
-            
-        export_data = []
-        for group_name, df in self.group_dfs.items():
-            sections = df['Section'].tolist()
-            gpa = self.group_gpas.get(group_name)
-            z_score = self.group_z_scores.get(group_name)
-            group_data = {
-                'Group Name': df['Group Name'].iloc[0] if 'Group Name' in df.columns else group_name,
-                'GPA': gpa if gpa is not None else 'N/A',
-                'Z-Score': z_score if z_score is not None else 'N/A',
-                'Sections': ', '.join(sections)
-            }
-            export_data.append(group_data)
-        
-        export_df = pd.DataFrame(export_data)
-        export_df.to_csv(filepath, index=False)
-        return True
+        return self._export('group_data', filepath)
 
     def export_student_list(self, filepath, list_type='good'):
         """Export good or work list to a CSV file"""
+        return self._export('good_list' if list_type == 'good' else 'work_list', filepath)
+
+    def get_student_list_table(self, list_type='good'):
+        """
+        The good or work list as a table with Student Name, ID, GPA and Sections columns,
+        in list order. GPA is NaN for students with no graded sections.
+        The table is cached until the lists or the selected sections change; don't modify it.
+        """
+        if list_type not in self._table_cache:
+            self._table_cache[list_type] = self._build_student_list_table(list_type)
+        return self._table_cache[list_type]
+
+    def _build_student_list_table(self, list_type):
         student_list = self.good_list if list_type == 'good' else self.work_list
-        if not student_list:
-            return False
-            
-        export_data = []
-        for student_id, info in student_list.items():
-            student_data = {
-                'Student Name': info['name'],
-                'Student ID': student_id,
-                'Classes': ', '.join(info['classes'])
-            }
-            export_data.append(student_data)
+        student_ids = student_list.student_ids()
+        gpas = self.get_student_gpas(student_ids)
+        return pd.DataFrame({
+            'Student Name': student_list.student_names(),
+            'ID': student_ids,
+            'GPA': np.array([gpas[student_id] for student_id in student_ids], dtype=np.float64),
+            'Sections': student_list.joined_classes()
+        }, columns=['Student Name', 'ID', 'GPA', 'Sections'])
+
+    def _list_appearances(self, student_ids=None):
+        """
+        Every good and work list appearance as one DataFrame, in the order the history is read:
+        current good list classes, current work list classes, then earlier terms' entries from
+        the history store. Columns: ID, Name, Section, List ('good' or 'work'), Grade (A on the
+        good list, "?" where a work list grade cannot be found in the selected sections) and
+        Current (False for history store entries). With student_ids, only those students.
+        """
+        good_ids, good_names, good_sections = self.good_list.rows()
+        work_ids, work_names, work_sections = self.work_list.rows()
+        if student_ids is None:
+            entries = self._history_entries()
+        else:
+            student_ids = list(student_ids)
+            entries = self.history.entries_for(student_ids)
+            keep_good = pd.Index(good_ids).isin(student_ids)
+            keep_work = pd.Index(work_ids).isin(student_ids)
+            good_ids, good_names, good_sections = good_ids[keep_good], good_names[keep_good], good_sections[keep_good]
+            work_ids, work_names, work_sections = work_ids[keep_work], work_names[keep_work], work_sections[keep_work]
         
-        export_df = pd.DataFrame(export_data)
-        export_df.to_csv(filepath, index=False)
-        return True
+        # Work list grades in one lookup; the first row wins for a student listed twice in a section
+        work_grades = pd.DataFrame({'ID': work_ids, 'Section': work_sections}).merge(
+            self._section_grades(pd.unique(work_ids)), how='left', on=['ID', 'Section'])['Grade']
+        current = len(good_ids) + len(work_ids)
+        return pd.DataFrame({
+            'ID': np.concatenate([good_ids, work_ids, np.asarray(entries['ID'], dtype=object)]),
+            'Name': np.concatenate([good_names, work_names, np.asarray(entries['Name'], dtype=object)]),
+            'Section': np.concatenate([good_sections, work_sections, np.asarray(entries['Section'], dtype=object)]),
+            'List': np.concatenate([np.repeat(np.array(['good', 'work'], dtype=object),
+                                              [len(good_ids), len(work_ids)]),
+                                    np.asarray(entries['List'], dtype=object)]),
+            'Grade': np.concatenate([np.full(len(good_ids), 'A', dtype=object),
+                                     work_grades.fillna('?').to_numpy(dtype=object),
+                                     np.asarray(entries['Grade'], dtype=object)]),
+            'Current': np.arange(current + len(entries)) < current
+        })
+
+    @staticmethod
+    def _classes_and_grades(appearances):
+        """
+        Each student's appearances formatted like "MATH101.01: A" and joined, as a Series keyed
+        by ID in order of first appearance. Current list classes all show, in list order; a
+        history store entry shows once, and only when its section is not on a current list.
+        """
+        student_codes, student_ids = pd.factorize(appearances['ID'])
+        section_codes, sections = pd.factorize(appearances['Section'])
+        pairs = student_codes.astype(np.int64) * max(len(sections), 1) + section_codes
+        current = appearances['Current'].to_numpy()
+        text = (appearances['Section'] + ': ' + appearances['Grade']).to_numpy(dtype=object)
+        repeated = pd.DataFrame({'student': student_codes, 'text': text}).duplicated().to_numpy()
+        keep = current | ~(np.isin(pairs, pairs[current]) | repeated)
+        
+        # Group the kept rows by student, keeping row order within each, then join slices
+        order = np.argsort(student_codes[keep], kind='stable')
+        texts = text[keep][order].tolist()
+        bounds = np.r_[0, np.cumsum(np.bincount(student_codes[keep], minlength=len(student_ids)))].tolist()
+        return pd.Series([', '.join(texts[start:stop]) for start, stop in zip(bounds[:-1], bounds[1:])],
+                         index=pd.Index(student_ids, dtype=object), dtype=object)
+
+    @profiled('history')
+    def _history_patterns(self):
+        """
+        The history analysis in one pass over every list appearance (see _list_appearances):
+        one row per student with a pattern, with ID, Student Name, the repeat_good, repeat_work
+        and mixed flags and Classes and Grades. Rows come in get_history_summary order.
+        A student's sections count once per list however often they appear; the name is the
+        one from their first appearance. Cached like get_student_list_table.
+        """
+        if 'history_patterns' in self._table_cache:
+            return self._table_cache['history_patterns']
+        appearances = self._list_appearances()
+        student_codes, student_ids = pd.factorize(appearances['ID'])
+        section_codes, sections = pd.factorize(appearances['Section'])
+        section_count = max(len(sections), 1)
+        pairs = student_codes.astype(np.int64) * section_count + section_codes
+        on_good = (appearances['List'] == 'good').to_numpy()
+        good_count = np.bincount(np.unique(pairs[on_good]) // section_count, minlength=len(student_ids))
+        work_count = np.bincount(np.unique(pairs[~on_good]) // section_count, minlength=len(student_ids))
+        
+        # The three patterns never overlap; the summary lists each pattern's students in turn
+        repeat_good = (good_count > 1) & (work_count == 0)
+        repeat_work = (work_count > 1) & (good_count == 0)
+        mixed = (good_count > 0) & (work_count > 0)
+        pattern = np.select([repeat_good, repeat_work, mixed], [0, 1, 2], 3)
+        order = np.argsort(pattern, kind='stable')
+        order = order[pattern[order] < 3]
+        
+        first_rows = np.unique(student_codes, return_index=True)[1]
+        flagged = appearances[(pattern < 3)[student_codes]]
+        patterns = pd.DataFrame({
+            'ID': np.asarray(student_ids, dtype=object)[order],
+            'Student Name': appearances['Name'].to_numpy(dtype=object)[first_rows][order],
+            'repeat_good': repeat_good[order],
+            'repeat_work': repeat_work[order],
+            'mixed': mixed[order]
+        })
+        patterns['Classes and Grades'] = self._classes_and_grades(flagged).reindex(patterns['ID']).to_numpy()
+        self._table_cache['history_patterns'] = patterns
+        return patterns
 
     def analyze_student_history(self):
         """
@@ -420,151 +1953,131 @@ class GPAProcessor:
         1. Students who appear on the good list multiple times
         2. Students who appear on the work list multiple times
         3. Students who appear on both good and work lists
+        Earlier terms' list entries from the history store count as well, for students
+        enrolled in the selected sections.
         """
-        repeat_good = {}
-        repeat_work = {}
-        mixed = {}
-        
-        # Track the good list and work list appearances by section
-        student_appearances = {}
-        
-        # Process good list
-        for student_id, info in self.good_list.items():
-            if student_id not in student_appearances:
-                student_appearances[student_id] = {
-                    'name': info['name'],
-                    'good_classes': set(info['classes']),
-                    'work_classes': set()
-                }
-            else:
-                student_appearances[student_id]['good_classes'].update(info['classes'])
-        
-        # Process work list
-        for student_id, info in self.work_list.items():
-            if student_id not in student_appearances:
-                student_appearances[student_id] = {
-                    'name': info['name'],
-                    'good_classes': set(),
-                    'work_classes': set(info['classes'])
-                }
+        patterns = self._history_patterns()
+        appearances = self._list_appearances(patterns['ID'])
+        classes = (appearances.drop_duplicates(['ID', 'Section', 'List'])
+                   .groupby(['ID', 'List'], sort=False)['Section'].agg(list))
+        result = {'repeat_good': {}, 'repeat_work': {}, 'mixed': {}}
+        for student_id, name, repeat_good, repeat_work, mixed in patterns[
+                ['ID', 'Student Name', 'repeat_good', 'repeat_work', 'mixed']].itertuples(index=False):
+            good_classes = classes.get((student_id, 'good'), [])
+            work_classes = classes.get((student_id, 'work'), [])
+            if repeat_good:
+                result['repeat_good'][student_id] = {'name': name, 'classes': good_classes}
+            elif repeat_work:
+                result['repeat_work'][student_id] = {'name': name, 'classes': work_classes}
             else:
-                student_appearances[student_id]['work_classes'].update(info['classes'])
-        
-        # Analyze the patterns
-        for student_id, info in student_appearances.items():
-            good_count = len(info['good_classes'])
-            work_count = len(info['work_classes'])
-            
-            if good_count > 1 and work_count == 0:
-                # Student appears on good list multiple times
-                repeat_good[student_id] = {
-                    'name': info['name'],
-                    'classes': list(info['good_classes'])
-                }
-            
-            if work_count > 1 and good_count == 0:
-                # Student appears on work list multiple times
-                repeat_work[student_id] = {
-                    'name': info['name'],
-                    'classes': list(info['work_classes'])
-                }
-            
-            if good_count > 0 and work_count > 0:
-                # Student appears on both good and work lists
-                mixed[student_id] = {
-                    'name': info['name'],
-                    'good_classes': list(info['good_classes']),
-                    'work_classes': list(info['work_classes'])
-                }
-        
-        return {
-            'repeat_good': repeat_good,
-            'repeat_work': repeat_work,
-            'mixed': mixed
-        }
+                result['mixed'][student_id] = {'name': name, 'good_classes': good_classes, 'work_classes': work_classes}
+        return result
+
+    def _history_entries(self):
+        """History store rows for students enrolled in the selected sections."""
+        if not len(self.history):
+            return self.history.records
+        return self.history.entries_for(self._active_student_ids())
 
     def get_history_summary(self):
         """
         Create a summary of student history patterns.
         Returns a dictionary with student ID keys and flags for different patterns.
         """
-        history_patterns = self.analyze_student_history()
-        
-        # Create a consolidated view for all students
-        summary = {}
-        
-        # Process students with multiple A grades
-        for student_id, info in history_patterns['repeat_good'].items():
-            summary[student_id] = {
-                'name': info['name'],
-                'repeat_good': True,
-                'repeat_work': False,
-                'mixed': False
-            }
-        
-        # Process students with multiple D/F grades
-        for student_id, info in history_patterns['repeat_work'].items():
-            if student_id in summary:
-                summary[student_id]['repeat_work'] = True
-            else:
-                summary[student_id] = {
-                    'name': info['name'],
-                    'repeat_good': False,
-                    'repeat_work': True,
-                    'mixed': False
-                }
-        
-        # Process students with mixed performance
-        for student_id, info in history_patterns['mixed'].items():
-            if student_id in summary:
-                summary[student_id]['mixed'] = True
-            else:
-                summary[student_id] = {
-                    'name': info['name'],
-                    'repeat_good': False,
-                    'repeat_work': False,
-                    'mixed': True
-                }
-                
-        return summary
+        patterns = self._history_patterns()
+        return {student_id: {'name': name, 'repeat_good': repeat_good, 'repeat_work': repeat_work, 'mixed': mixed}
+                for student_id, name, repeat_good, repeat_work, mixed in patterns[
+                    ['ID', 'Student Name', 'repeat_good', 'repeat_work', 'mixed']].itertuples(index=False)}
+
+    def _section_grades(self, student_ids):
+        """
+        Look up the grades of the given students in the selected sections.
+        Returns a DataFrame with ID, Section and Grade columns, one row per (ID, Section)
+        pair; the first row wins for duplicates.
+        """
+        enrollments = self._active_enrollments()
+        enrollments = enrollments[enrollments['ID'].isin(list(student_ids))].drop_duplicates(['ID', 'Section'])
+        return pd.DataFrame({column: np.asarray(enrollments[column], dtype=object) for column in ['ID', 'Section', 'Grade']})
+
+    def get_student_classes_and_grades(self, student_id):
+        """
+        Format a student's good and work list classes with their grades, e.g. "MATH101.01: A",
+        followed by list entries from earlier terms in the history store.
+        Grades that cannot be found in the selected sections show as "?".
+        """
+        return self._classes_and_grades(self._list_appearances([student_id])).get(student_id, "")
+
+    def get_history_table(self):
+        """
+        The history summary as a table: Student Name, ID, GPA, the three pattern flags
+        and each student's classes and grades. Cached like get_student_list_table.
+        """
+        if 'history' not in self._table_cache:
+            self._table_cache['history'] = self._build_history_table()
+        return self._table_cache['history']
+
+    def _build_history_table(self):
+        patterns = self._history_patterns()
+        gpas = self.get_student_gpas(patterns['ID'].tolist())
+        return pd.DataFrame({
+            'Student Name': patterns['Student Name'],
+            'ID': patterns['ID'],
+            'GPA': np.array([gpas[student_id] for student_id in patterns['ID']], dtype=np.float64),
+            'Good List Multiple Times': patterns['repeat_good'],
+            'Work List Multiple Times': patterns['repeat_work'],
+            'Both Lists': patterns['mixed'],
+            'Classes and Grades': patterns['Classes and Grades']
+        }, columns=['Student Name', 'ID', 'GPA', 'Good List Multiple Times',
+                    'Work List Multiple Times', 'Both Lists', 'Classes and Grades'])
 
     def export_history_data(self, filepath):
         """Export student history data to a CSV file"""
-        history_summary = self.get_history_summary()
-        if not history_summary:
-            return False
-            
-        # Create export data
-        export_data = []
-        for student_id, info in history_summary.items():
-            export_data.append({
-                'Student Name': info['name'],
-                'Student ID': student_id,
-                'Good List Multiple Times': 'Yes' if info['repeat_good'] else 'No',
-                'Work List Multiple Times': 'Yes' if info['repeat_work'] else 'No',
-                'Both Lists': 'Yes' if info['mixed'] else 'No'
-            })
-        
-        # Convert to DataFrame and export
-        export_df = pd.DataFrame(export_data)
-        export_df.to_csv(filepath, index=False)
-        return True
+        return self._export('history', filepath)
+
+    def get_student_enrollments(self, student_id):
+        """
+        Get every section, grade and credit-hour row for a student across all loaded sections.
+        """
+        rows = self.student_index.rows_for(student_id)
+        return self.grade_store.iloc[rows][['Section', 'Grade', 'Credit Hours', 'Numeric Grade']]
+
+    def _student_gpa_totals(self):
+        """
+        Weighted grade points and credits per student code for the selected sections.
+        Computed once and reused until the selected sections change.
+        """
+        if self._student_totals is None:
+            enrollments = self._active_enrollments()
+            # Only the first row for a student in each section counts
+            enrollments = enrollments.drop_duplicates(['ID', 'Section'])
+            valid = enrollments[enrollments['Numeric Grade'].notna()]  # Only count valid grades
+            codes = valid['ID'].cat.codes.to_numpy()
+            credit_hours = valid['Credit Hours'].to_numpy(np.float64)
+            student_count = len(self.student_index.ids)
+            points = np.bincount(codes, weights=valid['Numeric Grade'].to_numpy() * credit_hours,
+                                 minlength=student_count)
+            credits = np.bincount(codes, weights=credit_hours, minlength=student_count)
+            self._student_totals = (points, credits)
+        return self._student_totals
+
+    def get_student_gpas(self, student_ids):
+        """
+        Calculate GPAs for many students at once.
+        Returns a dictionary of student ID -> GPA (None when the student has no graded sections).
+        """
+        student_ids = list(student_ids)
+        points, credits = self._student_gpa_totals()
+        codes = self.student_index.codes_for(student_ids)
+        known = codes >= 0
+        student_points = np.zeros(len(codes))
+        student_credits = np.zeros(len(codes))
+        student_points[known] = points[codes[known]]
+        student_credits[known] = credits[codes[known]]
+        gpas = np.divide(student_points, student_credits,
+                         out=np.full(len(codes), np.nan), where=student_credits > 0)
+        return {student_id: (None if np.isnan(gpa) else float(gpa))
+                for student_id, gpa in zip(student_ids, gpas)}
 
     def get_student_gpa(self, student_id):
         """Calculate GPA for a specific student across all their sections"""
-        total_points = 0.0
-        total_credits = 0.0
-        
-        for section_name, df in self.section_dfs.items():
-            student_row = df[df['ID'] == student_id]
-            if not student_row.empty:
-                numeric_grade = student_row['Numeric Grade'].iloc[0]
-                if pd.notna(numeric_grade):  # Only count valid grades
-                    credit_hours = self.section_credit_hours.get(section_name, 3.0)
-                    total_points += numeric_grade * credit_hours
-                    total_credits += credit_hours
-        
-        if total_credits > 0:
-            return total_points / total_credits
-        else:
-            return None
+        return self.get_student_gpas([student_id])[student_id]
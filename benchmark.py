@@ -0,0 +1,158 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from backEnd import GPAProcessor, parse_section_file
+from dataGenerator import SCALES, generate_dataset
+
+# Results from every benchmark run are appended here, one JSON object per line
+DEFAULT_RESULTS_FILE = "benchmark_results.jsonl"
+
+
+def time_stage(timings, name, func, *args, **kwargs):
+    """Call func, add its wall time to timings[name] and return its result."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    timings.setdefault(name, []).append(time.perf_counter() - start)
+    return result
+
+
+def run_pipeline(directory, export_dir, timings, workers=1):
+    """Run each GPAProcessor stage once over directory, recording per-stage times."""
+    processor = GPAProcessor()
+    time_stage(timings, "load_files_to_dataframes", processor.load_files_to_dataframes, directory, workers=workers)
+    time_stage(timings, "calculate_all_gpas", processor.calculate_all_gpas)
+    time_stage(timings, "calculate_z_scores", processor.calculate_z_scores)
+    time_stage(timings, "populate_good_work_lists", processor.populate_good_work_lists)
+    time_stage(timings, "get_history_summary", processor.get_history_summary)
+
+    time_stage(timings, "export_section_data", processor.export_section_data,
+               os.path.join(export_dir, "section_data.csv"))
+    time_stage(timings, "export_group_data", processor.export_group_data,
+               os.path.join(export_dir, "group_data.csv"))
+    time_stage(timings, "export_good_list", processor.export_student_list,
+               os.path.join(export_dir, "good_list.csv"), list_type='good')
+    time_stage(timings, "export_work_list", processor.export_student_list,
+               os.path.join(export_dir, "work_list.csv"), list_type='work')
+    time_stage(timings, "export_history_data", processor.export_history_data,
+               os.path.join(export_dir, "history.csv"))
+
+    # A run switch as the dashboard does it: select, recompute GPAs and lists
+    def switch_runs():
+        for run_name in processor.run_dfs:
+            processor.select_run(run_name)
+            processor.calculate_all_gpas()
+            processor.populate_good_work_lists()
+    time_stage(timings, "select_run", switch_runs)
+    return processor
+
+
+def time_section_parsers(directory, timings):
+    """Parse every .sec file with the quoted-row fast path and with the csv reader alone."""
+    paths = [os.path.join(directory, file) for file in sorted(os.listdir(directory))
+             if file.lower().endswith('.sec')]
+    time_stage(timings, "parse_sec_fast_path",
+               lambda: [parse_section_file(path) for path in paths])
+    time_stage(timings, "parse_sec_csv_reader",
+               lambda: [parse_section_file(path, fast_path=False) for path in paths])
+
+
+def summarize(timings):
+    """Reduce repeated timings to min/median/max seconds per stage."""
+    return {
+        name: {
+            'min': min(values),
+            'median': float(np.median(values)),
+            'max': max(values),
+            'repeats': len(values)
+        }
+        for name, values in timings.items()
+    }
+
+
+def load_previous(results_file, scale):
+    """Return the most recent recorded result for the same scale, if any."""
+    if not os.path.exists(results_file):
+        return None
+    previous = None
+    with open(results_file, "r") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                record = json.loads(line)
+                if record.get('scale') == scale:
+                    previous = record
+    return previous
+
+
+def print_report(record, previous):
+    print(f"Scale {record['scale']}: {record['sections']} sections, {record['enrollments']} enrollments")
+    print(f"{'Stage':<28}{'Median (s)':>12}{'Previous (s)':>14}{'Change':>10}")
+    for name, stats in record['stages'].items():
+        line = f"{name:<28}{stats['median']:>12.4f}"
+        if previous and name in previous['stages']:
+            before = previous['stages'][name]['median']
+            change = (stats['median'] - before) / before * 100 if before > 0 else 0.0
+            line += f"{before:>14.4f}{change:>9.1f}%"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time each GPAProcessor stage on synthetic data.")
+    parser.add_argument("-s", "--scale", choices=sorted(SCALES), default="1k",
+                        help="preset dataset size (default: 1k sections)")
+    parser.add_argument("-d", "--data-dir",
+                        help="use or create the dataset here instead of a temporary directory")
+    parser.add_argument("-n", "--repeat", type=int, default=3, help="times to run each stage (default: 3)")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="processes for section parsing (default: 1)")
+    parser.add_argument("-o", "--output", default=DEFAULT_RESULTS_FILE,
+                        help=f"JSON-lines file results are appended to (default: {DEFAULT_RESULTS_FILE})")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the dataset (default: 0)")
+    args = parser.parse_args(argv)
+
+    work_dir = tempfile.mkdtemp(prefix="gpa_bench_")
+    try:
+        data_dir = args.data_dir or os.path.join(work_dir, "data")
+        if not os.path.isdir(data_dir) or not os.listdir(data_dir):
+            sections, min_students, max_students = SCALES[args.scale]
+            info = generate_dataset(data_dir, sections=sections, min_students=min_students,
+                                    max_students=max_students, seed=args.seed)
+            print(f"Generated {info['sections']} sections ({info['enrollments']} enrollments) in {data_dir}")
+
+        timings = {}
+        for _ in range(args.repeat):
+            processor = run_pipeline(data_dir, work_dir, timings, workers=args.workers)
+            time_section_parsers(data_dir, timings)
+
+        record = {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'scale': args.scale,
+            'sections': len(processor.all_section_dfs),
+            'enrollments': len(processor.grade_store),
+            'workers': args.workers,
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'stages': summarize(timings)
+        }
+        previous = load_previous(args.output, args.scale)
+        with open(args.output, "a") as f:
+            f.write(json.dumps(record) + "\n")
+        print_report(record, previous)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,415 @@
+"""
+Out-of-core processing mode for GPAProcessor.
+
+ChunkedGPAProcessor streams section files (and the records of section bundles)
+in batches sized to a memory ceiling
+instead of keeping every enrollment in memory. Each batch adds to per-section
+statistics, per-student grade point totals for every run, and the rows that can
+put a student on the good or work list; then it is dropped:
+
+    processor = ChunkedGPAProcessor(memory_limit_mb=128)
+    processor.load_files_to_dataframes("StateArchive", workers=4)
+    processor.calculate_all_gpas()
+    processor.populate_good_work_lists()
+
+Section and group GPAs, z-scores, the overall GPA, student GPAs and the good/work
+lists come out as with GPAProcessor, for all data and for each run file. A
+section's rows are re-read from its file only when it is accessed.
+"""
+import functools
+import os
+import time
+from collections.abc import Mapping
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+from pandas.api.types import union_categoricals
+
+from backEnd import (GPAProcessor, GradeCube, StudentIndex, ProcessingCancelled, GRADE_MAP, GOOD_LIST_MIN_GRADE,
+                     WORK_LIST_MAX_GRADE, SECTION_COLUMNS, PARALLEL_MIN_FILES, BUNDLE_EXTENSION,
+                     BUNDLE_BATCH_SECTIONS, build_grade_store, build_section_stats, list_file_type,
+                     parse_bundle_records, parse_group_file, parse_list_file, parse_run_file, parse_section_codes,
+                     parse_section_file, profiled, read_bundle_ranges)
+
+DEFAULT_MEMORY_LIMIT_MB = 256
+
+# Parsing and accumulating a batch peaks at roughly this many bytes per byte of section file
+BYTES_PER_FILE_BYTE = 12
+
+
+def parse_section_source(source):
+    """Parse a section from a .sec file path or a (bundle_path, start, stop) bundle record."""
+    if isinstance(source, tuple):
+        bundle_path, start, stop = source
+        return parse_bundle_records(bundle_path, [(start, stop)])[0]
+    return parse_section_file(source)
+
+
+def plan_batches(paths, sizes, batch_bytes):
+    """
+    Split paths into consecutive batches whose file sizes add up to at most batch_bytes.
+    A file bigger than batch_bytes gets a batch of its own.
+    """
+    batches = []
+    batch, total = [], 0
+    for path, size in zip(paths, sizes):
+        if batch and total + size > batch_bytes:
+            batches.append(batch)
+            batch, total = [], 0
+        batch.append(path)
+        total += size
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+class FileSectionView(Mapping):
+    """
+    Read-only dict-like view of sections that re-reads a section's file (or bundle record)
+    when it is accessed. paths maps section names to sources as parse_section_source takes them.
+    """
+    def __init__(self, paths, names=None):
+        self.paths = paths
+        self.names = list(paths) if names is None else list(names)
+        self._name_set = set(self.names)
+
+    def __getitem__(self, section_name):
+        if section_name not in self._name_set:
+            raise KeyError(section_name)
+        parsed = parse_section_source(self.paths[section_name])
+        return pd.DataFrame({
+            'Name': parsed['names'],
+            'ID': parsed['ids'],
+            'Grade': parsed['grades'],
+            'Numeric Grade': np.array([np.nan if GRADE_MAP.get(g) is None else GRADE_MAP[g]
+                                       for g in parsed['grades']], dtype=np.float64)
+        }, columns=SECTION_COLUMNS)
+
+    def __contains__(self, section_name):
+        return section_name in self._name_set
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def copy(self):
+        return FileSectionView(self.paths, self.names)
+
+    def subset(self, section_names):
+        """Return a view restricted to the given sections, keeping load order."""
+        section_names = set(section_names)
+        return FileSectionView(self.paths, [n for n in self.names if n in section_names])
+
+
+class ChunkedGPAProcessor(GPAProcessor):
+    """
+    GPAProcessor that never holds more than about memory_limit_mb of enrollments at once.
+    The ceiling covers the batch being processed; the accumulated per-section statistics,
+    per-student totals and list candidates grow with the number of sections and students.
+    """
+    def __init__(self, memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB):
+        super().__init__()
+        self.memory_limit_mb = memory_limit_mb
+        self._run_totals = {None: (np.zeros(0), np.zeros(0))}  # Run name (None for all data) -> (points, credits) per student
+        self._run_students = {None: np.zeros(0, dtype=bool)}    # Run name -> students enrolled in its sections
+        self._candidates = self.grade_store                     # Rows that can put a student on a list
+
+    @profiled('load', rows=lambda self: self.load_stats.get('section_files', 0))
+    def load_files_to_dataframes(self, directory, workers=1, use_cache=False, progress=None, cancel_event=None):
+        """
+        Stream the .sec files and section bundle records of a directory in batches that fit
+        the memory ceiling, after reading its .grp, .run and .runthis files.
+        use_cache is ignored in this mode.
+        good*.lst and work*.lst files are added to the student history store.
+        """
+        if progress is not None:
+            progress('Listing files', None, None)
+        start_time = time.perf_counter()
+        extensions = ('.run', '.grp', '.sec', '.runthis', BUNDLE_EXTENSION)
+        group_dfs, run_dfs = {}, {}
+        section_paths = []
+        bundle_paths = []
+        section_sources = []  # .sec files and (bundle_path, start, stop) bundle records in directory order
+        file_stats = {}
+        history_records = []
+        for file in os.listdir(directory):
+            file_path = os.path.join(directory, file)
+            list_type = list_file_type(file)
+            if list_type is not None:
+                try:
+                    history_records.append(parse_list_file(file_path, list_type))
+                except Exception as e:
+                    print(f"Could not read {file}: {e}")
+                    raise
+            elif file.lower().endswith(extensions):
+                file_name, ext = os.path.splitext(file)
+                ext = ext.lower()
+                try:
+                    file_stats[file_path] = os.stat(file_path)
+                    if ext == '.sec':
+                        section_paths.append(file_path)
+                        section_sources.append(file_path)
+                    elif ext == BUNDLE_EXTENSION:
+                        bundle_paths.append(file_path)
+                        section_sources.extend((file_path, start, stop) for start, stop in read_bundle_ranges(file_path))
+                    elif ext == '.grp':
+                        group_dfs[file_name] = parse_group_file(file_path)
+                    else:
+                        run_dfs[file_name] = parse_run_file(file_path)
+                except Exception as e:
+                    print(f"Could not read {file}: {e}")
+                    raise
+
+        # Every run's sections are known before streaming, so each batch updates every run's totals
+        run_sections = {None: None}
+        for run_name, run_df in run_dfs.items():
+            valid_groups = set(run_df['Group'].tolist())
+            run_sections[run_name] = {section for df in group_dfs.values()
+                                      if len(df) and df['Group Name'].iloc[0] in valid_groups
+                                      for section in df['Section']}
+
+        sizes = {source: source[2] - source[1] if isinstance(source, tuple) else file_stats[source].st_size
+                 for source in section_sources}
+        streamed = self._stream_sections(section_sources, sizes, run_sections, workers, progress, cancel_event)
+        parsed_count = len(section_sources)
+
+        # A repeated section name replaces the earlier file but keeps its place, as in a full load
+        section_files = {}
+        for section_name, source in zip(streamed['names'], section_sources):
+            section_files[section_name] = source
+        if streamed['repeated']:
+            # Names are only known once parsed, so stream again over the copies that win
+            streamed = self._stream_sections(list(section_files.values()), sizes, run_sections, workers,
+                                             progress, cancel_event)
+            parsed_count += len(section_files)
+        student_codes, totals, enrolled = streamed['student_codes'], streamed['totals'], streamed['enrolled']
+        stats_parts, candidate_parts = streamed['stats_parts'], streamed['candidate_parts']
+        credit_hours = streamed['credit_hours']
+
+        if progress is not None:
+            progress('Building statistics', None, None)
+        student_ids = list(student_codes)
+        self.student_index = StudentIndex(pd.DataFrame({'ID': pd.Categorical(student_ids, categories=student_ids)}))
+        self._run_totals = totals
+        self._run_students = enrolled
+        self._candidates = build_grade_store([])[0]
+        candidate_parts = [part for part in candidate_parts if len(part)]
+        if candidate_parts:
+            self._candidates = pd.DataFrame({
+                column: (union_categoricals([part[column] for part in candidate_parts], ignore_order=True)
+                         if column in ('Section', 'Name', 'ID', 'Grade')
+                         else np.concatenate([part[column].to_numpy() for part in candidate_parts]))
+                for column in self._candidates.columns
+            })
+        self.section_stats = pd.concat(stats_parts) if stats_parts else build_section_stats(self._candidates, {})
+        self.section_terms = parse_section_codes(self.section_stats.index)
+        self.section_credit_hours = credit_hours
+
+        self.all_section_dfs = FileSectionView(section_files)
+        self.section_dfs = self.all_section_dfs.copy()
+        self.group_dfs = group_dfs
+        self.all_group_dfs = group_dfs.copy()
+        self.run_dfs = run_dfs
+        self._all_group_members = self._build_group_members(group_dfs)
+        self.grade_cube = GradeCube(self.section_stats, self.section_terms, self._all_group_members)
+        self.section_gpas = {}
+        self.group_gpas = {}
+        self.directory = directory
+        self.selected_run = None
+        self._file_signatures = {os.path.basename(path): (stat.st_mtime_ns, stat.st_size)
+                                 for path, stat in file_stats.items()}
+        self._clear_student_caches()
+
+        if history_records:
+            self.history.add(pd.concat(history_records, ignore_index=True))
+            if self.history_path is not None:
+                self.history.save(self.history_path)
+
+        elapsed = time.perf_counter() - start_time
+        if workers is None:
+            workers = os.cpu_count() or 1
+        self.load_stats = {
+            'files': len(self.section_dfs) + len(self.group_dfs) + len(self.run_dfs),
+            'section_files': len(section_paths),
+            'bundles': len(bundle_paths),
+            'bundle_sections': sum(isinstance(source, tuple) for source in section_sources),
+            'parsed_files': parsed_count,
+            'cached_files': 0,
+            'batches': streamed['batches'],
+            'workers': workers if len(section_files) >= PARALLEL_MIN_FILES else 1,
+            'seconds': elapsed,
+            'files_per_sec': len(section_paths) / elapsed if elapsed > 0 else 0.0
+        }
+        return len(self.section_dfs) + len(self.group_dfs) + len(self.run_dfs)
+
+    def _stream_sections(self, sources, sizes, run_sections, workers, progress=None, cancel_event=None):
+        """
+        Parse sources in batches that fit the memory ceiling, adding each batch to the
+        per-section statistics, every run's per-student totals and the list candidates.
+        Returns a dictionary of the accumulated results and the section name of each source.
+        Once a section name repeats, the rest is only parsed for names and 'repeated' is set.
+        """
+        batch_bytes = max(1, self.memory_limit_mb * 1024 * 1024 // BYTES_PER_FILE_BYTE)
+        batches = plan_batches(sources, [sizes[source] for source in sources], batch_bytes)
+
+        names = []
+        student_codes = {}
+        totals = {run_name: (np.zeros(0), np.zeros(0)) for run_name in run_sections}
+        enrolled = {run_name: np.zeros(0, dtype=bool) for run_name in run_sections}
+        stats_parts, candidate_parts = [], []
+        credit_hours = {}
+        repeated = False
+        done = 0
+        for batch in batches:
+            if cancel_event is not None and cancel_event.is_set():
+                raise ProcessingCancelled("Load cancelled")
+            parsed_sections = self._parse_batch(batch, workers, cancel_event)
+            for parsed in parsed_sections:
+                repeated = repeated or parsed['section'] in credit_hours
+                names.append(parsed['section'])
+                credit_hours[parsed['section']] = parsed['credit_hours']
+            done += len(batch)
+            if progress is not None:
+                progress('Parsing section files', done, len(sources))
+            if repeated:
+                continue
+            store, _ = build_grade_store(parsed_sections)
+            stats_parts.append(build_section_stats(store, credit_hours))
+            self._accumulate(store, student_codes, run_sections, totals, enrolled)
+            numeric = store['Numeric Grade']
+            candidates = store[(numeric >= GRADE_MAP[GOOD_LIST_MIN_GRADE]) | (numeric <= GRADE_MAP[WORK_LIST_MAX_GRADE])]
+            candidate_parts.append(candidates.assign(**{column: candidates[column].cat.remove_unused_categories()
+                                                        for column in ('Name', 'ID', 'Grade')}))
+        return {
+            'names': names,
+            'repeated': repeated,
+            'student_codes': student_codes,
+            'totals': totals,
+            'enrolled': enrolled,
+            'stats_parts': stats_parts,
+            'candidate_parts': candidate_parts,
+            'credit_hours': credit_hours,
+            'batches': len(batches)
+        }
+
+    def _parse_batch(self, batch, workers, cancel_event=None):
+        """
+        Parse a batch of section sources: .sec files in one pass over the files, and the
+        records of each bundle in groups of BUNDLE_BATCH_SECTIONS. Results are in batch order.
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        paths = [source for source in batch if not isinstance(source, tuple)]
+        parsed = dict(zip(paths, self._parse_sections(paths, workers, cancel_event=cancel_event)))
+        records = {}
+        for source in batch:
+            if isinstance(source, tuple):
+                records.setdefault(source[0], []).append(source)
+        for bundle_path, sources in records.items():
+            jobs = [[(start, stop) for _, start, stop in sources[i:i + BUNDLE_BATCH_SECTIONS]]
+                    for i in range(0, len(sources), BUNDLE_BATCH_SECTIONS)]
+            results = self._run_parse_jobs(functools.partial(parse_bundle_records, bundle_path), jobs,
+                                           [len(job) for job in jobs], workers, 1, 'Parsing section files',
+                                           cancel_event=cancel_event)
+            parsed.update(zip(sources, chain.from_iterable(results)))
+        return [parsed[source] for source in batch]
+
+    @staticmethod
+    def _accumulate(store, student_codes, run_sections, totals, enrolled):
+        """Add one batch's grade points, credits and enrolled students to every run's running totals."""
+        id_categories = store['ID'].cat.categories
+        code_map = np.fromiter((student_codes.setdefault(student_id, len(student_codes)) for student_id in id_categories),
+                               dtype=np.int64, count=len(id_categories))
+        codes = code_map[store['ID'].cat.codes.to_numpy()]
+        student_count = len(student_codes)
+        section_codes = store['Section'].cat.codes.to_numpy()
+
+        # Only a student's first row in a section counts, as in GPAProcessor._student_gpa_totals
+        first = ~pd.DataFrame({'section': section_codes, 'student': codes}).duplicated().to_numpy()
+        numeric = store['Numeric Grade'].to_numpy()
+        graded = first & ~np.isnan(numeric)
+        credit_hours = store['Credit Hours'].to_numpy(np.float64)
+
+        for run_name, sections in run_sections.items():
+            if sections is None:
+                in_run = np.ones(len(store), dtype=bool)
+            else:
+                in_run = store['Section'].cat.categories.isin(list(sections))[section_codes]
+            points, credits = totals[run_name]
+            students = enrolled[run_name]
+            # New students from this batch start at zero
+            points = np.pad(points, (0, student_count - len(points)))
+            credits = np.pad(credits, (0, student_count - len(credits)))
+            students = np.pad(students, (0, student_count - len(students)))
+            rows = in_run & graded
+            points += np.bincount(codes[rows], weights=numeric[rows] * credit_hours[rows], minlength=student_count)
+            credits += np.bincount(codes[rows], weights=credit_hours[rows], minlength=student_count)
+            students[codes[in_run]] = True
+            totals[run_name] = (points, credits)
+            enrolled[run_name] = students
+
+    def _active_enrollments(self):
+        """
+        The kept list candidates that belong to the currently selected sections.
+        Only rows at or above GOOD_LIST_MIN_GRADE or at or below WORK_LIST_MAX_GRADE are kept.
+        """
+        sections = self._candidates['Section']
+        active = sections.cat.categories.isin(list(self.section_dfs.keys()))
+        return self._candidates[active[sections.cat.codes.to_numpy()]]
+
+    def _list_candidates(self):
+        return self._candidates
+
+    def _active_student_ids(self):
+        return self.student_index.ids[self._run_students[self.selected_run]]
+
+    def _student_gpa_totals(self):
+        if self._student_totals is None:
+            self._student_totals = self._run_totals[self.selected_run]
+        return self._student_totals
+
+    def build_student_list(self, min_grade=None, max_grade=None, sections=None):
+        """
+        Find students with at least one grade between min_grade and max_grade in the selected
+        sections. Only the good and work list cutoffs (or stricter ones) are available in this mode.
+        """
+        good_ok = min_grade is not None and GRADE_MAP[min_grade] >= GRADE_MAP[GOOD_LIST_MIN_GRADE]
+        work_ok = max_grade is not None and GRADE_MAP[max_grade] <= GRADE_MAP[WORK_LIST_MAX_GRADE]
+        if not (good_ok or work_ok):
+            raise ValueError(f"Chunked mode only keeps grades of {GOOD_LIST_MIN_GRADE} and above "
+                             f"or {WORK_LIST_MAX_GRADE} and below")
+        return super().build_student_list(min_grade, max_grade, sections)
+
+    def get_student_enrollments(self, student_id):
+        """
+        Get every section, grade and credit-hour row for a student across all loaded sections.
+        Reads every section file, so use it for single lookups only.
+        """
+        rows = []
+        for section_name in self.all_section_dfs:
+            df = self.all_section_dfs[section_name]
+            for grade, numeric in zip(df.loc[df['ID'] == student_id, 'Grade'], df.loc[df['ID'] == student_id, 'Numeric Grade']):
+                rows.append((section_name, grade, self.section_credit_hours.get(section_name, 3.0), numeric))
+        return pd.DataFrame(rows, columns=['Section', 'Grade', 'Credit Hours', 'Numeric Grade'])
+
+    @profiled('refresh')
+    def refresh_changed_files(self):
+        """
+        Stream the directory again if any file was added, modified or deleted since the
+        last load or refresh, then recompute GPAs and lists for the current run selection.
+        Returns the (added, modified, deleted) file names.
+        """
+        added, modified, deleted = self.scan_for_changes()
+        if not (added or modified or deleted):
+            return added, modified, deleted
+        selected_run = self.selected_run
+        self.load_files_to_dataframes(self.directory)
+        if selected_run in self.run_dfs:
+            self.select_run(selected_run)
+        self.calculate_all_gpas()
+        self.populate_good_work_lists()
+        return added, modified, deleted
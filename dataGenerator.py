@@ -0,0 +1,125 @@
+import os
+import random
+import argparse
+
+# Preset sizes: number of sections and the range of students per section.
+# "100k" comes to about one million enrollments.
+SCALES = {
+    "small": (40, 10, 35),
+    "1k": (1000, 10, 35),
+    "10k": (10000, 10, 35),
+    "100k": (100000, 5, 15)
+}
+
+DEPARTMENTS = ["COMSC", "ENGR", "MATH", "PHYS", "CHEM", "BIOL", "ENGL", "HIST"]
+TERMS = ["F", "S"]
+
+# Letter grades with rough real-world frequencies, including non-GPA grades
+GRADE_WEIGHTS = {
+    "A": 20, "A-": 10, "B+": 10, "B": 12, "B-": 8, "C+": 7, "C": 8, "C-": 5,
+    "D+": 3, "D": 3, "D-": 2, "F": 5, "W": 4, "I": 1, "P": 1, "NP": 1
+}
+
+ID_CHARS = "AEBcdfklMNQuQyzp"
+NAME_CHARS = "abcdefghijklmnopqrstuvwxyz"
+
+
+def random_name(rng):
+    last = rng.choice(NAME_CHARS).upper() + "".join(rng.choices(NAME_CHARS, k=rng.randint(4, 9)))
+    first = rng.choice(NAME_CHARS).upper() + "".join(rng.choices(NAME_CHARS, k=rng.randint(3, 7)))
+    # A few apostrophe names, as in "O'Brien, Dylan"
+    if rng.random() < 0.03:
+        last = "O'" + last
+    return f"{last}, {first}"
+
+
+def generate_students(rng, count):
+    """Return a list of (name, id) pairs with unique IDs."""
+    ids = set()
+    while len(ids) < count:
+        ids.add("".join(rng.choices(ID_CHARS, k=7)))
+    return [(random_name(rng), student_id) for student_id in sorted(ids)]
+
+
+def generate_dataset(directory, sections=1000, min_students=10, max_students=35,
+                     runs=4, seed=0):
+    """
+    Write a synthetic tree of .sec, .grp and .run files into directory.
+    Sections get codes like COMSC330.01F18, groups collect one department's courses
+    at one level (e.g. COMSC300) and each run selects a random subset of groups.
+    Returns a dictionary describing what was written.
+    """
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+
+    # Students take about ten sections each, so the pool scales with the enrollments
+    expected_enrollments = sections * (min_students + max_students) // 2
+    students = generate_students(rng, max(max_students, expected_enrollments // 10))
+    grades = list(GRADE_WEIGHTS)
+    weights = list(GRADE_WEIGHTS.values())
+
+    groups = {}
+    used_codes = set()
+    enrollments = 0
+    while len(used_codes) < sections:
+        department = rng.choice(DEPARTMENTS)
+        course = rng.randint(100, 499)
+        code = (f"{department}{course}.{rng.randint(1, 9):02d}"
+                f"{rng.choice(TERMS)}{rng.randint(0, 24):02d}")
+        if code in used_codes:
+            continue
+        used_codes.add(code)
+
+        credit_hours = rng.choices(["3.0", "4.0", "1.0"], weights=[85, 12, 3])[0]
+        roster = rng.sample(students, rng.randint(min_students, max_students))
+        lines = [f"{code}  {credit_hours}"]
+        for (name, student_id), grade in zip(roster, rng.choices(grades, weights=weights, k=len(roster))):
+            # Mix the quoting styles seen in real exports
+            separator = ", " if rng.random() < 0.2 else ","
+            lines.append(separator.join([f'"{name}"', f'"{student_id}"', f'"{grade}"']))
+        with open(os.path.join(directory, f"{code}.sec"), "w") as f:
+            f.write("\n".join(lines) + "\n")
+        enrollments += len(roster)
+        groups.setdefault(f"{department}{course // 100}00", []).append(code)
+
+    for group_name, codes in groups.items():
+        with open(os.path.join(directory, f"{group_name}.GRP"), "w") as f:
+            f.write("\n".join([group_name] + [f"{code}.sec" for code in codes]) + "\n")
+
+    group_names = sorted(groups)
+    for run_number in range(1, runs + 1):
+        run_name = f"RUN{run_number:02d}"
+        selected = rng.sample(group_names, max(1, len(group_names) // 2))
+        with open(os.path.join(directory, f"{run_name}.run"), "w") as f:
+            f.write("\n".join([run_name] + [f"{name}.GRP" for name in selected]) + "\n")
+
+    return {
+        'directory': directory,
+        'sections': sections,
+        'groups': len(groups),
+        'runs': runs,
+        'students': len(students),
+        'enrollments': enrollments
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic .sec/.grp/.run test data.")
+    parser.add_argument("directory", help="where to write the files")
+    parser.add_argument("-s", "--scale", choices=sorted(SCALES), default="1k",
+                        help="preset size (default: 1k sections)")
+    parser.add_argument("--sections", type=int, help="override the number of sections")
+    parser.add_argument("--runs", type=int, default=4, help="number of .run files (default: 4)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    args = parser.parse_args(argv)
+
+    sections, min_students, max_students = SCALES[args.scale]
+    info = generate_dataset(args.directory, sections=args.sections or sections,
+                            min_students=min_students, max_students=max_students,
+                            runs=args.runs, seed=args.seed)
+    print(f"Wrote {info['sections']} sections, {info['groups']} groups, {info['runs']} runs "
+          f"({info['enrollments']} enrollments) to {info['directory']}")
+
+
+if __name__ == "__main__":
+    main()
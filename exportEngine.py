@@ -0,0 +1,137 @@
+"""
+Writes export tables straight from DataFrames to disk, without going through the UI.
+
+Tables are written a chunk of rows at a time, so formatting a large history or student
+list never holds more than one chunk of text in memory, and write_tables writes several
+exports at once on worker threads. Formats:
+
+    csv      plain CSV, as the export buttons have always written
+    csv.gz   gzip-compressed CSV
+    npz      one NumPy array per column in an .npz archive (np.load reads it back)
+    parquet  Parquet, only when pyarrow is installed
+"""
+import gzip
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = pq = None
+
+# File extension written for each export format
+EXPORT_FORMATS = {
+    'csv': '.csv',
+    'csv.gz': '.csv.gz',
+    'npz': '.npz',
+    'parquet': '.parquet'
+}
+
+# Rows formatted and written at a time
+EXPORT_CHUNK_ROWS = 50000
+
+
+def available_formats():
+    """Export formats usable in this environment, in EXPORT_FORMATS order."""
+    return [name for name in EXPORT_FORMATS if name != 'parquet' or pq is not None]
+
+
+def format_for_path(path):
+    """The export format a file name asks for, by its extension; CSV when it matches none."""
+    lower = path.lower()
+    for name, extension in sorted(EXPORT_FORMATS.items(), key=lambda item: -len(item[1])):
+        if lower.endswith(extension):
+            return name
+    return 'csv'
+
+
+def formatted_chunks(table, formatters=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Yield table in slices of chunk_rows rows, with formatters[column] applied to each value."""
+    formatters = formatters or {}
+    for start in range(0, len(table), chunk_rows):
+        chunk = table.iloc[start:start + chunk_rows]
+        if formatters:
+            chunk = chunk.assign(**{column: chunk[column].map(formatter)
+                                    for column, formatter in formatters.items() if column in chunk.columns})
+        yield chunk
+
+
+def column_array(column):
+    """
+    A column as a plain NumPy array np.load can read without pickle: text becomes
+    fixed-width strings, with missing text left empty.
+    """
+    if column.dtype.kind in 'biufcmM':
+        return column.to_numpy()
+    if isinstance(column.dtype, pd.api.extensions.ExtensionDtype) and column.dtype.kind in 'iuf':
+        return column.to_numpy(dtype=np.float64, na_value=np.nan)  # Nullable integers, NA as NaN
+    return column.astype(object).fillna('').astype(str).to_numpy(dtype=str)
+
+
+def write_table(table, path, file_format=None, formatters=None, na_rep='N/A', chunk_rows=EXPORT_CHUNK_ROWS):
+    """
+    Write a DataFrame to path without its index. file_format is one of EXPORT_FORMATS,
+    taken from the file extension when not given. formatters maps column names to
+    functions turning each value into its exported text; na_rep fills missing values in CSV.
+    The file appears only once complete: it is written to path + '.tmp' and then renamed.
+    Returns path.
+    """
+    file_format = file_format or format_for_path(path)
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{file_format}'.")
+    if file_format == 'parquet' and pq is None:
+        raise ValueError("Parquet export needs pyarrow, which is not installed.")
+
+    tmp_path = path + ".tmp"
+    try:
+        if file_format in ('csv', 'csv.gz'):
+            opener = gzip.open if file_format == 'csv.gz' else open
+            with opener(tmp_path, 'wt', newline='', encoding='utf-8') as f:
+                table.iloc[:0].to_csv(f, index=False)
+                for chunk in formatted_chunks(table, formatters, chunk_rows):
+                    chunk.to_csv(f, index=False, header=False, na_rep=na_rep)
+        elif file_format == 'npz':
+            # The layout np.savez writes, filled one column at a time
+            with zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_STORED, allowZip64=True) as archive:
+                for column in table.columns:
+                    values = table[column]
+                    if column in (formatters or {}):
+                        values = values.map(formatters[column])
+                    with archive.open(f"{column}.npy", 'w', force_zip64=True) as f:
+                        np.lib.format.write_array(f, column_array(values), allow_pickle=False)
+        else:
+            schema = pa.Schema.from_pandas(table, preserve_index=False)
+            with pq.ParquetWriter(tmp_path, schema) as writer:
+                for start in range(0, len(table), chunk_rows):
+                    writer.write_table(pa.Table.from_pandas(table.iloc[start:start + chunk_rows], schema=schema,
+                                                            preserve_index=False))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+def write_tables(tables, output_dir, file_format='csv', workers=None, na_rep='N/A'):
+    """
+    Write each table of a {name: DataFrame} dictionary to output_dir/name plus the format's
+    extension, all at the same time on worker threads (one per table unless workers is given).
+    The tables should not change while they are written; pass copies or cached tables.
+    Returns {name: path}. If any table fails, the others still finish and the first error is raised.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {name: os.path.join(output_dir, name + EXPORT_FORMATS[file_format]) for name in tables}
+    if not tables:
+        return paths
+    with ThreadPoolExecutor(max_workers=workers or len(tables)) as executor:
+        futures = [executor.submit(write_table, table, paths[name], file_format, None, na_rep)
+                   for name, table in tables.items()]
+    for future in futures:
+        future.result()
+    return paths
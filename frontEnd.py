@@ -1,9 +1,162 @@
 import tkinter as tk
+import multiprocessing
+import threading
+import queue
 from tkinter import filedialog, ttk, messagebox
 import os
-import csv
 
-from backEnd import GPAProcessor
+from backEnd import GPAProcessor, ProcessingCancelled, profiled, sort_filter_table
+from exportEngine import EXPORT_FORMATS, available_formats, write_table
+
+# How often watch mode checks the directory for changed files
+WATCH_INTERVAL_MS = 2000
+
+# How often the UI checks a background job for progress
+JOB_POLL_MS = 100
+
+# Filters are applied once typing pauses for this long
+FILTER_DELAY_MS = 300
+
+# Rows moved per mouse wheel notch in the virtual tables
+WHEEL_ROWS = 3
+
+# Save dialog labels for the export formats
+EXPORT_FILE_TYPES = {
+    'csv': 'CSV Files',
+    'csv.gz': 'Gzipped CSV Files',
+    'npz': 'NumPy Column Archives',
+    'parquet': 'Parquet Files'
+}
+
+# Student history from good.lst/work.lst files is kept here between sessions
+HISTORY_FILE = os.path.join(os.path.expanduser("~"), ".gpa_history.pkl")
+
+def format_gpa(gpa):
+    return "N/A" if gpa != gpa else f"{gpa:.2f}"  # NaN means no graded sections
+
+def format_flag(flag):
+    return "✓" if flag else ""
+
+class VirtualTable:
+    """
+    Shows a DataFrame in a Treeview one screenful at a time.
+    Only the visible rows exist as Treeview items; scrolling swaps in values from the
+    table. Sorting (by clicking a heading) and filtering are done by the backend.
+    """
+    def __init__(self, treeview, scrollbar, formatters=None):
+        self.treeview = treeview
+        self.scrollbar = scrollbar
+        self.columns = list(treeview['columns'])
+        self.formatters = formatters or {}
+        self.table = None
+        self.view = None
+        self.offset = 0
+        self.visible_rows = int(treeview['height'])
+        self.sort_column = None
+        self.descending = False
+        self.filter_text = ""
+        
+        style = ttk.Style()
+        self.row_height = int(style.lookup("Treeview", "rowheight") or 20)
+        
+        scrollbar.configure(command=self.on_scroll)
+        for column in self.columns:
+            treeview.heading(column, command=lambda c=column: self.sort_by(c))
+        treeview.bind("<Configure>", self.on_resize)
+        treeview.bind("<MouseWheel>", self.on_mouse_wheel)
+        treeview.bind("<Button-4>", lambda event: self.scroll_rows(-WHEEL_ROWS))
+        treeview.bind("<Button-5>", lambda event: self.scroll_rows(WHEEL_ROWS))
+        treeview.bind("<Prior>", lambda event: self.scroll_rows(-self.visible_rows))
+        treeview.bind("<Next>", lambda event: self.scroll_rows(self.visible_rows))
+
+    @property
+    def row_count(self):
+        return 0 if self.view is None else len(self.view)
+
+    def set_table(self, table):
+        """Show a new table, keeping the current sort and filter."""
+        self.table = table
+        self.offset = 0
+        self.refresh()
+
+    def set_filter(self, text):
+        self.filter_text = text.strip()
+        self.offset = 0
+        self.refresh()
+
+    def sort_by(self, column):
+        # Clicking the sorted column again reverses it
+        if self.sort_column == column:
+            self.descending = not self.descending
+        else:
+            self.sort_column = column
+            self.descending = False
+        for name in self.columns:
+            arrow = (" ▼" if self.descending else " ▲") if name == column else ""
+            self.treeview.heading(name, text=name + arrow)
+        self.offset = 0
+        self.refresh()
+
+    def refresh(self):
+        if self.table is None:
+            self.view = None
+        else:
+            self.view = sort_filter_table(self.table, self.sort_column, self.descending, self.filter_text)
+        self.render()
+
+    def render(self):
+        """Fill the Treeview items with the rows currently in view."""
+        self.offset = max(0, min(self.offset, self.row_count - self.visible_rows))
+        rows = []
+        if self.view is not None:
+            for values in self.view.iloc[self.offset:self.offset + self.visible_rows].itertuples(index=False):
+                rows.append([self.formatters[column](value) if column in self.formatters else value
+                             for column, value in zip(self.columns, values)])
+        
+        # Reuse the existing items rather than deleting and inserting
+        items = self.treeview.get_children()
+        for item, row in zip(items, rows):
+            self.treeview.item(item, values=row)
+        for row in rows[len(items):]:
+            self.treeview.insert("", "end", values=row)
+        if len(items) > len(rows):
+            self.treeview.delete(*items[len(rows):])
+        
+        if self.row_count:
+            self.scrollbar.set(self.offset / self.row_count,
+                               min(1.0, (self.offset + self.visible_rows) / self.row_count))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll_rows(self, count):
+        offset = max(0, min(self.offset + count, self.row_count - self.visible_rows))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+        return "break"  # Keep the Treeview from scrolling its own items
+
+    def on_scroll(self, action, amount, unit=None):
+        if action == "moveto":
+            self.offset = int(float(amount) * self.row_count)
+            self.render()
+        elif unit == "pages":
+            self.scroll_rows(int(amount) * self.visible_rows)
+        else:
+            self.scroll_rows(int(amount))
+
+    def on_mouse_wheel(self, event):
+        return self.scroll_rows(-WHEEL_ROWS if event.delta > 0 else WHEEL_ROWS)
+
+    def on_resize(self, event):
+        # Leave room for the heading row
+        visible_rows = max(1, (event.height - self.row_height - 5) // self.row_height)
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self.render()
+
+    def sort_filter(self, table):
+        """table sorted and filtered the way this view currently is, e.g. for exporting what it shows."""
+        return sort_filter_table(table, self.sort_column, self.descending, self.filter_text)
 
 class GPAAnalysisApp:
     def __init__(self, root):
@@ -13,7 +166,11 @@ class GPAAnalysisApp:
         self.root.configure(bg="#121212")
         
         self.processor = GPAProcessor()
+        self.profiler = self.processor.profiler  # UI refreshes are recorded alongside backend stages
         self.file_directory = None
+        self._watch_job = None
+        self._job = None  # Background load or run switch, see run_in_background
+        self._filter_jobs = {}
 
         # Main layout
         self.main_frame = tk.Frame(self.root, bg="#1E1E1E")
@@ -47,6 +204,18 @@ class GPAAnalysisApp:
             "Work List": tk.Frame(self.content_area, bg="#2A2A2A"),
             "History": tk.Frame(self.content_area, bg="#2A2A2A")  # Add history tab
         }
+        
+        # Tabs are refreshed only when shown, and only if their data changed since
+        self.tab_updaters = {
+            "Dashboard": self.update_summary,
+            "Section Data": self.update_section_data,
+            "Group Data": self.update_group_data,
+            "Good List": self.update_good_list,
+            "Work List": self.update_work_list,
+            "History": self.update_history_data
+        }
+        self.dirty_tabs = set()
+        self.current_tab = None
 
         self.setup_dashboard_tab()
         self.setup_section_tab()
@@ -74,28 +243,35 @@ class GPAAnalysisApp:
 
     def show_section(self):
         self.show_tab("Section Data")
-        self.update_section_data()
 
     def show_group(self):
         self.show_tab("Group Data")
-        self.update_group_data()
 
     def show_good_list(self):
         self.show_tab("Good List")
-        self.update_good_list()
 
     def show_bad_list(self):
         self.show_tab("Work List")
-        self.update_work_list()
 
     def show_history(self):
         self.show_tab("History")
-        self.update_history_data()  # Fix the method name
 
     def show_tab(self, tab_name):
         for tab in self.tabs.values():
             tab.pack_forget()
         self.tabs[tab_name].pack(fill="both", expand=True)
+        self.current_tab = tab_name
+        # Rebuild the tab if its data changed while it was hidden; a running job
+        # refreshes it when it finishes
+        if tab_name in self.dirty_tabs and self._job is None:
+            self.dirty_tabs.discard(tab_name)
+            self.tab_updaters[tab_name]()
+
+    def invalidate_views(self):
+        """Mark every tab out of date after the data changed and refresh the visible one."""
+        self.dirty_tabs = set(self.tabs)
+        if self.current_tab is not None:
+            self.show_tab(self.current_tab)
 
     def setup_dashboard_tab(self):
         dashboard = self.tabs["Dashboard"]
@@ -120,14 +296,44 @@ class GPAAnalysisApp:
                  fg="white", bg="#2A2A2A").pack(side="left", padx=5)
         self.run_file_combobox = ttk.Combobox(run_frame, values=[])
         self.run_file_combobox.pack(side="left", padx=5)
-        apply_run_btn = tk.Button(run_frame, text="Apply Run", command=self.apply_run_selection)
-        apply_run_btn.pack(side="left", padx=5)
-        
-        # Process button
-        process_btn = tk.Button(dashboard, text="Process Files", command=self.process_files,
-                                bg="#4CAF50", fg="white", font=("Arial", 12, "bold"),
-                                padx=20, pady=10)
-        process_btn.pack(pady=20)
+        self.apply_run_btn = tk.Button(run_frame, text="Apply Run", command=self.apply_run_selection)
+        self.apply_run_btn.pack(side="left", padx=5)
+        
+        # Process and cancel buttons
+        button_frame = tk.Frame(dashboard, bg="#2A2A2A")
+        button_frame.pack(pady=20)
+        self.process_btn = tk.Button(button_frame, text="Process Files", command=self.process_files,
+                                     bg="#4CAF50", fg="white", font=("Arial", 12, "bold"),
+                                     padx=20, pady=10)
+        self.process_btn.pack(side="left", padx=5)
+        self.cancel_btn = tk.Button(button_frame, text="Cancel", command=self.cancel_job,
+                                    bg="#B71C1C", fg="white", font=("Arial", 12, "bold"),
+                                    padx=20, pady=10, state="disabled")
+        self.cancel_btn.pack(side="left", padx=5)
+        
+        # Watch mode picks up files instructors add or correct after processing
+        self.watch_var = tk.BooleanVar(value=False)
+        watch_check = tk.Checkbutton(dashboard, text="Watch directory for changes", variable=self.watch_var,
+                                     command=self.toggle_watch, font=("Arial", 11), fg="white", bg="#2A2A2A",
+                                     selectcolor="#333333", activebackground="#2A2A2A", activeforeground="white")
+        watch_check.pack()
+        
+        # Opt-in per-stage timings, shown under the status line
+        self.profile_var = tk.BooleanVar(value=False)
+        profile_check = tk.Checkbutton(dashboard, text="Show stage timings", variable=self.profile_var,
+                                       command=self.toggle_profiling, font=("Arial", 11), fg="white", bg="#2A2A2A",
+                                       selectcolor="#333333", activebackground="#2A2A2A", activeforeground="white")
+        profile_check.pack()
+        
+        # All five exports at once, written by the backend while the UI stays usable
+        export_frame = tk.Frame(dashboard, bg="#2A2A2A")
+        export_frame.pack(pady=10)
+        tk.Label(export_frame, text="Export All As:", font=("Arial", 12),
+                 fg="white", bg="#2A2A2A").pack(side="left", padx=5)
+        self.export_format_combobox = ttk.Combobox(export_frame, values=available_formats(), state="readonly", width=10)
+        self.export_format_combobox.current(0)
+        self.export_format_combobox.pack(side="left", padx=5)
+        tk.Button(export_frame, text="Export All", command=self.export_all).pack(side="left", padx=5)
         
         # Status frame
         self.status_frame = tk.Frame(dashboard, bg="#2A2A2A")
@@ -135,6 +341,9 @@ class GPAAnalysisApp:
         self.status_label = tk.Label(self.status_frame, text="Ready to process files.",
                                      font=("Arial", 12), fg="white", bg="#2A2A2A")
         self.status_label.pack(pady=5)
+        self.profile_label = tk.Label(self.status_frame, text="", font=("Courier", 10),
+                                      fg="#BBBBBB", bg="#2A2A2A", justify="left")
+        self.profile_label.pack(pady=5)
         
         # Summary statistics frame
         self.summary_frame = tk.Frame(dashboard, bg="#2A2A2A")
@@ -151,57 +360,191 @@ class GPAAnalysisApp:
         if not self.file_directory:
             messagebox.showerror("Error", "Please select a directory first")
             return
-        try:
-            self.status_label.config(text="Processing files...")
-            self.root.update()
-            file_count = self.processor.load_files_to_dataframes(self.file_directory)
-            self.processor.calculate_all_gpas()
-            self.processor.populate_good_work_lists()
-            self.update_summary()
-            self.update_section_data()
-            self.update_group_data()
-            self.update_good_list()
-            self.update_work_list()
-            self.update_history_data()  # Add this line
+        if self._job is not None:
+            return
+        self.status_label.config(text="Processing files...")
+        self.profiler.clear()
+        
+        # Load into a fresh processor so the tables keep showing the old data until it is done
+        processor = GPAProcessor()
+        processor.profiler = self.profiler
+        directory = self.file_directory
+
+        def work(progress, cancel_event):
+            processor.open_history(HISTORY_FILE)
+            file_count = processor.load_files_to_dataframes(directory, workers=None, use_cache=True,
+                                                            progress=progress, cancel_event=cancel_event)
+            progress('Calculating GPAs', None, None)
+            processor.calculate_all_gpas()
+            if cancel_event.is_set():
+                raise ProcessingCancelled("Load cancelled")
+            progress('Building good and work lists', None, None)
+            processor.populate_good_work_lists()
+            return file_count
+
+        def done(file_count):
+            self.processor = processor
             
             # Populate the run file combobox with keys from run_dfs
             run_files = list(self.processor.run_dfs.keys())
             print("DEBUG: Run files loaded:", run_files)
             self.run_file_combobox['values'] = ["ALLFILES"] + run_files  
             self.run_file_combobox.current(0)  
-            self.status_label.config(text=f"Processed {file_count} files successfully!")
-        except Exception as e:
+            self.invalidate_views()
+            files_per_sec = self.processor.load_stats.get('files_per_sec', 0.0)
+            self.status_label.config(text=f"Processed {file_count} files successfully! ({files_per_sec:.0f} files/sec)")
+            self.show_profile()
+
+        def failed(e):
             messagebox.showerror("Error", f"Error processing files: {str(e)}")
             self.status_label.config(text=f"Error: {str(e)}")
 
+        self.run_in_background(work, done, failed, cancellable=True)
+
     def apply_run_selection(self):
         selected_run = self.run_file_combobox.get()
         if not selected_run:
             messagebox.showwarning("Warning", "Please select a run file from the dropdown.")
             return
-        try:
+        if self._job is not None:
+            return
+        self.profiler.clear()
+        self.status_label.config(text=f"Applying run file '{selected_run}'...")
+        processor = self.processor
+
+        def work(progress, cancel_event):
             if selected_run == "ALLFILES":
                 # Reset to include all data
-                self.processor.section_dfs = self.processor.all_section_dfs.copy()
-                self.processor.group_dfs = self.processor.all_group_dfs.copy()
+                processor.reset_to_all_data()
             else:
-                self.processor.select_run(selected_run)
-            
-            self.processor.calculate_all_gpas()
-            # Add this line to rebuild good_list and work_list after selection
-            self.processor.populate_good_work_lists()
-            
+                processor.select_run(selected_run)
+            progress('Calculating GPAs', None, None)
+            processor.calculate_all_gpas()
+            # Rebuild good_list and work_list after selection
+            progress('Building good and work lists', None, None)
+            processor.populate_good_work_lists()
+
+        def done(result):
             # Update all relevant pages with filtered data
-            self.update_section_data()
-            self.update_group_data()
-            self.update_good_list()
-            self.update_work_list()
-            self.update_history_data()
-            self.update_summary()
+            self.invalidate_views()
             self.status_label.config(text=f"Run file '{selected_run}' applied successfully!")
-        except Exception as e:
+            self.show_profile()
+
+        def failed(e):
             messagebox.showerror("Error", str(e))
+            self.status_label.config(text=f"Error: {str(e)}")
 
+        # A half-applied run leaves the processor inconsistent, so this one cannot be cancelled
+        self.run_in_background(work, done, failed, cancellable=False)
+
+    def run_in_background(self, work, on_done, on_error, cancellable=False):
+        """
+        Run work(progress, cancel_event) on a worker thread while the UI stays responsive.
+        Progress messages are queued by the worker and shown from the Tk main loop;
+        on_done(result) or on_error(exception) is then called on the main loop as well.
+        """
+        events = queue.Queue()
+        cancel_event = threading.Event()
+
+        def progress(stage, done, total):
+            events.put(('progress', stage, done, total))
+
+        def target():
+            try:
+                events.put(('done', work(progress, cancel_event)))
+            except ProcessingCancelled:
+                events.put(('cancelled',))
+            except Exception as e:
+                events.put(('error', e))
+
+        self._job = {
+            'events': events,
+            'cancel_event': cancel_event,
+            'on_done': on_done,
+            'on_error': on_error
+        }
+        self.process_btn.config(state="disabled")
+        self.apply_run_btn.config(state="disabled")
+        self.cancel_btn.config(state="normal" if cancellable else "disabled")
+        threading.Thread(target=target, daemon=True).start()
+        self.root.after(JOB_POLL_MS, self._poll_job)
+
+    def _poll_job(self):
+        """Show queued progress from the background job and finish it once it is done."""
+        job = self._job
+        try:
+            while True:
+                event = job['events'].get_nowait()
+                kind = event[0]
+                if kind == 'progress':
+                    stage, done, total = event[1:]
+                    if total:
+                        self.status_label.config(text=f"{stage}... {done}/{total}")
+                    else:
+                        self.status_label.config(text=f"{stage}...")
+                    continue
+                
+                self._finish_job()
+                if kind == 'done':
+                    job['on_done'](event[1])
+                elif kind == 'error':
+                    job['on_error'](event[1])
+                else:
+                    self.status_label.config(text="Processing cancelled.")
+                return
+        except queue.Empty:
+            pass
+        self.root.after(JOB_POLL_MS, self._poll_job)
+
+    def _finish_job(self):
+        self._job = None
+        self.process_btn.config(state="normal")
+        self.apply_run_btn.config(state="normal")
+        self.cancel_btn.config(state="disabled")
+
+    def cancel_job(self):
+        if self._job is not None:
+            self._job['cancel_event'].set()
+            self.cancel_btn.config(state="disabled")
+            self.status_label.config(text="Cancelling...")
+
+    def toggle_watch(self):
+        if self._watch_job is not None:
+            self.root.after_cancel(self._watch_job)
+            self._watch_job = None
+        if self.watch_var.get():
+            self._watch_job = self.root.after(WATCH_INTERVAL_MS, self.poll_directory)
+
+    def poll_directory(self):
+        """Re-ingest files changed since the last check and refresh the views if any were found."""
+        self._watch_job = None
+        if not self.watch_var.get():
+            return
+        if self.processor.directory is not None and self._job is None:
+            try:
+                added, modified, deleted = self.processor.refresh_changed_files()
+                if added or modified or deleted:
+                    self.run_file_combobox['values'] = ["ALLFILES"] + list(self.processor.run_dfs.keys())
+                    self.invalidate_views()
+                    changed_count = len(added) + len(modified) + len(deleted)
+                    self.status_label.config(text=f"Updated {changed_count} changed files.")
+            except Exception as e:
+                self.status_label.config(text=f"Error: {str(e)}")
+        self._watch_job = self.root.after(WATCH_INTERVAL_MS, self.poll_directory)
+
+    def toggle_profiling(self):
+        if self.profile_var.get():
+            self.processor.enable_profiling()
+        else:
+            self.processor.disable_profiling()
+        self.profiler.clear()
+        self.show_profile()
+
+    def show_profile(self):
+        """Show the stage timings recorded since the last clear, if profiling is on."""
+        self.profile_label.config(text=self.profiler.summary_text() if self.profiler.enabled else "")
+
+    @profiled('ui: summary')
     def update_summary(self):
         for widget in self.summary_frame.winfo_children():
             widget.destroy()
@@ -272,34 +615,14 @@ class GPAAnalysisApp:
         table_frame.rowconfigure(0, weight=1)
         table_frame.columnconfigure(0, weight=1)
 
+    @profiled('ui: sections', rows=lambda app: len(app.section_table.get_children()))
     def update_section_data(self):
         for item in self.section_table.get_children():
             self.section_table.delete(item)
-        sections_data = self.processor.get_all_sections_data()
-        if not sections_data:
-            return
-        for section in sections_data:
-            gpa_text = f"{section['gpa']:.2f}" if section['gpa'] is not None else "N/A"
-            z_score_text = f"{section['z_score']:.2f}" if section['z_score'] is not None else "N/A"
-            dist = section['distribution']
-            row_data = [
-                section['name'],
-                gpa_text,
-                z_score_text,
-                dist.get("A", 0),
-                dist.get("A-", 0),
-                dist.get("B+", 0),
-                dist.get("B", 0),
-                dist.get("B-", 0),
-                dist.get("C+", 0),
-                dist.get("C", 0),
-                dist.get("C-", 0),
-                dist.get("D+", 0),
-                dist.get("D", 0),
-                dist.get("D-", 0),
-                dist.get("F", 0)
-            ]
-            self.section_table.insert("", "end", values=row_data)
+        # GPA, Z-Score and the grade counts all come from one vectorized table
+        for row in self.processor.get_section_table().itertuples(index=False):
+            section_name, gpa, z_score, *counts = row
+            self.section_table.insert("", "end", values=[section_name, format_gpa(gpa), format_gpa(z_score), *counts])
 
     def setup_group_tab(self):
         frame = self.tabs["Group Data"]
@@ -347,6 +670,7 @@ class GPAAnalysisApp:
         table_frame.rowconfigure(0, weight=1)
         table_frame.columnconfigure(0, weight=1)
 
+    @profiled('ui: groups', rows=lambda app: len(app.group_table.get_children()))
     def update_group_data(self):
         for item in self.group_table.get_children():
             self.group_table.delete(item)
@@ -405,52 +729,52 @@ class GPAAnalysisApp:
         table.column(columns[1], width=100, anchor="center")
         table.column(columns[2], width=100, anchor="center")  # GPA column
         table.column(columns[3], width=400, anchor="w")       # Sections column
-        scrollbar = ttk.Scrollbar(tab, orient="vertical", command=table.yview)
-        table.configure(yscrollcommand=scrollbar.set)
+        scrollbar = ttk.Scrollbar(tab, orient="vertical")
         table.pack(side="left", fill="both", expand=True, padx=(20, 0), pady=10)
         scrollbar.pack(side="right", fill="y", padx=(0, 20), pady=10)
+        view = VirtualTable(table, scrollbar, {"GPA": format_gpa})
+        self.create_filter_entry(header_frame, view)
         if "A Grades" in title:
             self.good_list_table = table
+            self.good_list_view = view
         else:
             self.work_list_table = table
+            self.work_list_view = view
+
+    def create_filter_entry(self, header_frame, view):
+        """Add a filter box to a tab header that filters view as the user types."""
+        filter_var = tk.StringVar()
+        tk.Entry(header_frame, textvariable=filter_var, width=25).pack(side="right", padx=5)
+        tk.Label(header_frame, text="Filter:", font=("Arial", 10),
+                 fg="white", bg="#2A2A2A").pack(side="right")
+
+        def apply_filter():
+            self._filter_jobs.pop(view, None)
+            view.set_filter(filter_var.get())
+
+        def schedule_filter(*args):
+            if view in self._filter_jobs:
+                self.root.after_cancel(self._filter_jobs[view])
+            self._filter_jobs[view] = self.root.after(FILTER_DELAY_MS, apply_filter)
 
+        filter_var.trace_add("write", schedule_filter)
+
+    def fit_column(self, treeview, column, table, min_width):
+        # 7 pixels per character is a rough estimate of the longest value's width
+        max_len = int(table[column].str.len().max()) if len(table) else 0
+        treeview.column(column, width=max(min_width, min(2000, max_len * 7)))
+
+    @profiled('ui: good list', rows=lambda app: app.good_list_view.row_count)
     def update_good_list(self):
-        for item in self.good_list_table.get_children():
-            self.good_list_table.delete(item)
-        good_list = self.processor.good_list
-        if not good_list:
-            return
-        max_len = 0
-        for student_id, info in good_list.items():
-            gpa = self.processor.get_student_gpa(student_id)
-            gpa_text = f"{gpa:.2f}" if gpa is not None else "N/A"
-            sections_str = ", ".join(info['classes'])
-            if len(sections_str) > max_len:
-                max_len = len(sections_str)
-            row_data = [info['name'], student_id, gpa_text, sections_str]
-            self.good_list_table.insert("", "end", values=row_data)
-        min_width = 400
-        new_width = max(min_width, min(2000, max_len * 7))
-        self.good_list_table.column("Sections", width=new_width)
+        table = self.processor.get_student_list_table('good')
+        self.good_list_view.set_table(table)
+        self.fit_column(self.good_list_table, "Sections", table, 400)
 
+    @profiled('ui: work list', rows=lambda app: app.work_list_view.row_count)
     def update_work_list(self):
-        for item in self.work_list_table.get_children():
-            self.work_list_table.delete(item)
-        work_list = self.processor.work_list
-        if not work_list:
-            return
-        max_len = 0
-        for student_id, info in work_list.items():
-            gpa = self.processor.get_student_gpa(student_id)
-            gpa_text = f"{gpa:.2f}" if gpa is not None else "N/A"
-            sections_str = ", ".join(info['classes'])
-            if len(sections_str) > max_len:
-                max_len = len(sections_str)
-            row_data = [info['name'], student_id, gpa_text, sections_str]
-            self.work_list_table.insert("", "end", values=row_data)
-        min_width = 400
-        new_width = max(min_width, min(2000, max_len * 7))
-        self.work_list_table.column("Sections", width=new_width)
+        table = self.processor.get_student_list_table('work')
+        self.work_list_view.set_table(table)
+        self.fit_column(self.work_list_table, "Sections", table, 400)
 
     def setup_history_tab(self):
         tab = self.tabs["History"]
@@ -464,6 +788,7 @@ class GPAAnalysisApp:
                               command=lambda: self.export_to_csv("History"),
                               bg="#4CAF50", fg="white", font=("Arial", 10))
         export_btn.pack(side="right", padx=20)
+        history_header_frame = header_frame
         
         # Add warning banner frame (hidden by default)
         self.history_warning_frame = tk.Frame(tab, bg="#FFF3CD", padx=10, pady=10)
@@ -511,14 +836,21 @@ class GPAAnalysisApp:
         self.history_table.column("Both Lists", width=150, anchor="center")
         self.history_table.column("Classes and Grades", width=500, anchor="w", stretch=tk.YES)
         
-        # Create vertical scrollbar
-        y_scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.history_table.yview)
-        self.history_table.configure(yscrollcommand=y_scrollbar.set)
+        # Create vertical scrollbar; the virtual table drives it
+        y_scrollbar = ttk.Scrollbar(table_frame, orient="vertical")
         
         # Create horizontal scrollbar
         x_scrollbar = ttk.Scrollbar(table_frame, orient="horizontal", command=self.history_table.xview)
         self.history_table.configure(xscrollcommand=x_scrollbar.set)
         
+        self.history_view = VirtualTable(self.history_table, y_scrollbar, {
+            "GPA": format_gpa,
+            "Good List Multiple Times": format_flag,
+            "Work List Multiple Times": format_flag,
+            "Both Lists": format_flag
+        })
+        self.create_filter_entry(history_header_frame, self.history_view)
+        
         # Place the treeview and scrollbars in the frame
         self.history_table.grid(row=0, column=0, sticky='nsew')
         y_scrollbar.grid(row=0, column=1, sticky='ns')
@@ -528,12 +860,9 @@ class GPAAnalysisApp:
         table_frame.rowconfigure(0, weight=1)
         table_frame.columnconfigure(0, weight=1)
 
+    @profiled('ui: history', rows=lambda app: app.history_view.row_count)
     def update_history_data(self):
         """Update the history table with student history patterns"""
-        # Clear existing data
-        for item in self.history_table.get_children():
-            self.history_table.delete(item)
-        
         # Check if a specific run filter is applied (not ALLFILES)
         current_run = self.run_file_combobox.get()
         if current_run != "ALLFILES" and current_run != "":
@@ -543,68 +872,36 @@ class GPAAnalysisApp:
             # Hide warning banner if it's visible
             self.history_warning_frame.pack_forget()
                 
-        # Get history data from processor
-        history_data = self.processor.get_history_summary()
-        if not history_data:
-            return
-                
-        # Populate the table
-        max_len = 0
-        for student_id, info in history_data.items():
-            # Get student's classes and grades
-            classes_grades = self.get_student_classes_and_grades(student_id)
-            if len(classes_grades) > max_len:
-                max_len = len(classes_grades)
-            # Calculate student GPA
-            gpa = self.processor.get_student_gpa(student_id)
-            gpa_text = f"{gpa:.2f}" if gpa is not None else "N/A"
-            row_data = [
-                info['name'],
-                student_id,
-                gpa_text,
-                "✓" if info['repeat_good'] else "",
-                "✓" if info['repeat_work'] else "",
-                "✓" if info['mixed'] else "",
-                classes_grades
-            ]
-            self.history_table.insert("", "end", values=row_data)
-
-        # Dynamically set column width based on max content length (approximate)
-        # 7 pixels per character is a rough estimate; adjust as needed
-        min_width = 500
-        new_width = max(min_width, min(2000, max_len * 7))
-        self.history_table.column("Classes and Grades", width=new_width)
-
-    def get_student_classes_and_grades(self, student_id):
-        """Get a formatted string of classes and grades for a student"""
-        classes_grades = []
-        
-        # Check good list
-        if student_id in self.processor.good_list:
-            for class_name in self.processor.good_list[student_id]['classes']:
-                classes_grades.append(f"{class_name}: A")
-        
-        # Check work list
-        if student_id in self.processor.work_list:
-            for class_name in self.processor.work_list[student_id]['classes']:
-                # Find the actual grade from section data
-                grade = self.find_student_grade(student_id, class_name)
-                classes_grades.append(f"{class_name}: {grade}")
-        
-        return ", ".join(classes_grades)
-
-    def find_student_grade(self, student_id, class_name):
-        """Find a student's grade in a specific class"""
-        if class_name in self.processor.section_dfs:
-            df = self.processor.section_dfs[class_name]
-            student_row = df[df['ID'] == student_id]
-            if not student_row.empty:
-                return student_row['Grade'].iloc[0]
-        return "?"  # Return ? if grade can't be found
+        # Get history rows, with GPAs and classes/grades, from the processor
+        table = self.processor.get_history_table()
+        self.history_view.set_table(table)
+        self.fit_column(self.history_table, "Classes and Grades", table, 500)
+
+    def export_table_for(self, data_type):
+        """
+        The table an export button writes and the formatters for its columns, taken from the
+        processor rather than the widgets. List and history exports keep the sort and filter
+        set on their tab, formatted as displayed; the table is None when there is nothing to export.
+        """
+        if data_type == "Section Data":
+            return (self.processor.get_section_table() if self.processor.section_dfs else None), {}
+        if data_type == "Group Data":
+            return (self.processor.get_group_table() if self.processor.group_dfs else None), \
+                {"GPA": format_gpa, "Z-Score": format_gpa}
+        if data_type == "Good List":
+            view, table = self.good_list_view, self.processor.get_student_list_table('good')
+        elif data_type == "Work List":
+            view, table = self.work_list_view, self.processor.get_student_list_table('work')
+        elif data_type == "History":
+            view, table = self.history_view, self.processor.get_history_table()
+        else:
+            raise ValueError(f"Unknown data type: {data_type}")
+        return view.sort_filter(table), view.formatters
 
     def export_to_csv(self, data_type):
-        """General export function that handles file selection and calls appropriate export method"""
-        file_types = [('CSV Files', '*.csv'), ('All Files', '*.*')]
+        """General export function that handles file selection and writes the export in the background"""
+        file_types = [(EXPORT_FILE_TYPES[name], '*' + EXPORT_FORMATS[name]) for name in available_formats()]
+        file_types.append(('All Files', '*.*'))
         default_name = f"{data_type.lower().replace(' ', '_')}_export.csv"
         
         filepath = filedialog.asksaveasfilename(
@@ -615,56 +912,64 @@ class GPAAnalysisApp:
         
         if not filepath:  # User cancelled
             return
-            
+        if self._job is not None:
+            messagebox.showwarning("Busy", "Please wait for processing to finish before exporting.")
+            return
         try:
-            if data_type == "Section Data":
-                success = self.processor.export_section_data(filepath)
-            elif data_type == "Group Data":
-                # Export exactly what's in the group_table
-                columns = ["Group Name", "GPA", "Z-Score", "Sections"]
-                self.export_treeview_to_csv(self.group_table, filepath, columns)
-                success = True
-            elif data_type == "Good List":
-                columns = ["Student Name", "ID", "GPA", "Sections"]
-                self.export_treeview_to_csv(self.good_list_table, filepath, columns)
-                success = True
-            elif data_type == "Work List":
-                columns = ["Student Name", "ID", "GPA", "Sections"]
-                self.export_treeview_to_csv(self.work_list_table, filepath, columns)
-                success = True
-            elif data_type == "History":
-                columns = [
-                    "Student Name", 
-                    "ID",
-                    "GPA",
-                    "Good List Multiple Times", 
-                    "Work List Multiple Times", 
-                    "Both Lists",
-                    "Classes and Grades"
-                ]
-                self.export_treeview_to_csv(self.history_table, filepath, columns)
-                success = True
-            else:
-                messagebox.showerror("Error", f"Unknown data type: {data_type}")
-                return
-                
-            if success:
-                messagebox.showinfo("Export Successful", f"{data_type} exported successfully to:\n{filepath}")
-            else:
-                messagebox.showwarning("No Data", f"No {data_type.lower()} available to export.")
+            table, formatters = self.export_table_for(data_type)
         except Exception as e:
             messagebox.showerror("Export Error", f"Error exporting data: {str(e)}")
+            return
+        if table is None:
+            messagebox.showwarning("No Data", f"No {data_type.lower()} available to export.")
+            return
+        self.status_label.config(text=f"Exporting {data_type.lower()}...")
+
+        def work(progress, cancel_event):
+            return write_table(table, filepath, formatters=formatters)
+
+        def done(path):
+            self.status_label.config(text=f"{data_type} exported to {path}")
+            messagebox.showinfo("Export Successful", f"{data_type} exported successfully to:\n{path}")
+
+        def failed(e):
+            self.status_label.config(text=f"Error: {str(e)}")
+            messagebox.showerror("Export Error", f"Error exporting data: {str(e)}")
+
+        self.run_in_background(work, done, failed)
+
+    def export_all(self):
+        """Write the section, group, good list, work list and history exports into one folder."""
+        if not self.processor.section_dfs:
+            messagebox.showwarning("No Data", "Process files before exporting.")
+            return
+        if self._job is not None:
+            messagebox.showwarning("Busy", "Please wait for processing to finish before exporting.")
+            return
+        directory = filedialog.askdirectory()
+        if not directory:
+            return
+        file_format = self.export_format_combobox.get()
+        processor = self.processor
+        self.status_label.config(text="Exporting...")
+
+        def work(progress, cancel_event):
+            return processor.export_all(directory, file_format)
+
+        def done(paths):
+            written = sum(path is not None for path in paths.values())
+            self.status_label.config(text=f"Exported {written} files to {directory}")
+            messagebox.showinfo("Export Successful", f"Exported {written} files to:\n{directory}")
+
+        def failed(e):
+            self.status_label.config(text=f"Error: {str(e)}")
+            messagebox.showerror("Export Error", f"Error exporting data: {str(e)}")
 
-    def export_treeview_to_csv(self, treeview, filepath, columns):
-        """Export the visible data in a Treeview to a CSV file."""
-        with open(filepath, "w", newline='', encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(columns)
-            for row_id in treeview.get_children():
-                row = treeview.item(row_id)['values']
-                writer.writerow(row)
+        self.run_in_background(work, done, failed)
 
 if __name__ == "__main__":
+    # Needed for the section-loading process pool in frozen (pyinstaller) builds
+    multiprocessing.freeze_support()
     root = tk.Tk()
     app = GPAAnalysisApp(root)
     root.mainloop()
@@ -1,3 +1,204 @@
-#
-# 
-#  
+"""
+Headless command-line entry point for the GPA analysis backend.
+
+Runs GPAProcessor over one or more directories without tkinter, writing the
+section, group, good list, work list and history exports for each run:
+
+    python main.py DIR [DIR ...] --output-dir exports --all-runs --jobs 4
+
+Exit code is 0 when every directory was processed, 1 when any failed.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from backEnd import GPAProcessor, HistoryStore
+from chunkedBackEnd import ChunkedGPAProcessor
+from sqliteBackEnd import SQLiteGPAProcessor
+from exportEngine import available_formats
+
+# Name used for the unfiltered view, matching the run dropdown in frontEnd.py
+ALL_RUNS = "ALLFILES"
+
+# Folder the --run-matrix comparison of every run file is written to
+RUN_MATRIX_DIR = "run_matrix"
+
+
+def export_run(processor, output_dir, export_format='csv'):
+    """Write the five exports for the current run selection into output_dir, all at once."""
+    processor.export_all(output_dir, export_format)
+
+
+def export_run_matrix(processor, output_dir):
+    """Write the run x group matrices and per-run summary from evaluate_all_runs into output_dir."""
+    os.makedirs(output_dir, exist_ok=True)
+    for name, table in processor.evaluate_all_runs().items():
+        table.to_csv(os.path.join(output_dir, f"{name}.csv"))
+
+
+def save_history(history_path, records):
+    """Add the history entries read by every directory to history_path, saving the file once."""
+    if not records:
+        return
+    history = HistoryStore.load(history_path)
+    history.add(pd.concat(records, ignore_index=True))
+    history.save(history_path)
+
+
+def process_directory(directory, output_dir, run_names=None, all_runs=False, workers=1, use_cache=False,
+                      history_path=None, memory_limit_mb=None, run_matrix=False, export_format='csv',
+                      database_path=None):
+    """
+    Load one directory, apply each requested run and export the results.
+    With history_path, the student history saved there is used for the history export, and
+    the entries this directory's .lst files add are returned for save_history rather than saved.
+    With memory_limit_mb, sections are streamed in batches that fit that much memory.
+    With database_path, the directory is ingested into that SQLite archive and the exports
+    cover everything the archive holds.
+    With run_matrix, every run file is also evaluated at once into a run_matrix folder.
+    export_format is one of exportEngine.EXPORT_FORMATS.
+    Returns a dictionary of timings and counts for reporting.
+    """
+    start_time = time.perf_counter()
+    if database_path:
+        processor = SQLiteGPAProcessor(database_path)
+    elif memory_limit_mb:
+        processor = ChunkedGPAProcessor(memory_limit_mb)
+    else:
+        processor = GPAProcessor()
+    history_count = 0
+    if history_path:
+        # Directories may run in parallel, so only main writes the file; see save_history
+        processor.open_history(history_path, autosave=False)
+        history_count = len(processor.history)
+    file_count = processor.load_files_to_dataframes(directory, workers=workers, use_cache=use_cache)
+    load_seconds = time.perf_counter() - start_time
+    if run_matrix:
+        export_run_matrix(processor, os.path.join(output_dir, RUN_MATRIX_DIR))
+
+    if all_runs:
+        runs = [ALL_RUNS] + list(processor.run_dfs.keys())
+    else:
+        runs = run_names or [ALL_RUNS]
+
+    for run in runs:
+        if run == ALL_RUNS:
+            processor.reset_to_all_data()
+        else:
+            processor.select_run(run)
+        processor.calculate_all_gpas()
+        processor.populate_good_work_lists()
+        export_run(processor, os.path.join(output_dir, run), export_format)
+    history = processor.history.records.iloc[history_count:] if history_path else None
+    if database_path:
+        processor.close()
+
+    return {
+        'directory': directory,
+        'files': file_count,
+        'runs': len(runs),
+        'load_seconds': load_seconds,
+        'total_seconds': time.perf_counter() - start_time,
+        # Added entries follow the ones already stored, which keep their places
+        'history': history
+    }
+
+
+def output_dirs_for(directories, output_root):
+    """One output folder per input directory, named after it and kept unique."""
+    output_dirs = []
+    used = set()
+    for directory in directories:
+        name = os.path.basename(os.path.normpath(directory)) or "data"
+        candidate, suffix = name, 2
+        while candidate in used:
+            candidate = f"{name}_{suffix}"
+            suffix += 1
+        used.add(candidate)
+        output_dirs.append(os.path.join(output_root, candidate))
+    return output_dirs
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run the GPA analysis without the GUI.")
+    parser.add_argument("directories", nargs="+", help="directories of .sec/.grp/.run files")
+    parser.add_argument("-o", "--output-dir", default="exports",
+                        help="where exports are written, one folder per directory (default: exports)")
+    run_group = parser.add_mutually_exclusive_group()
+    run_group.add_argument("-r", "--run", action="append", dest="runs", metavar="RUN",
+                           help=f"run file to apply (repeatable); default is {ALL_RUNS}")
+    run_group.add_argument("-a", "--all-runs", action="store_true",
+                           help=f"export {ALL_RUNS} and every run file found in each directory")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="directories processed at the same time (default: 1)")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="processes used to parse section files within a directory (default: 1)")
+    parser.add_argument("--cache", action="store_true",
+                        help="reuse the parsed-file cache kept in each directory")
+    parser.add_argument("--run-matrix", action="store_true",
+                        help=f"also compare every run file at once: run x group GPA, z-score and list-count "
+                             f"tables in a {RUN_MATRIX_DIR} folder")
+    parser.add_argument("-f", "--format", dest="export_format", choices=available_formats(), default="csv",
+                        help="file format of the exports (default: csv)")
+    parser.add_argument("--memory-limit", type=int, metavar="MB",
+                        help="stream section files in batches that fit about MB megabytes per directory, "
+                             "for archives too large to hold in memory")
+    parser.add_argument("--db", dest="database", metavar="PATH",
+                        help="ingest into the SQLite archive at PATH (created if missing) and export "
+                             "everything it holds; unchanged files are not parsed again")
+    parser.add_argument("--history", metavar="FILE",
+                        help="student history file that good.lst/work.lst entries are added to, "
+                             "once every directory has been processed")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.database and args.memory_limit:
+        parser.error("--db and --memory-limit cannot be used together")
+    if args.database and args.jobs > 1:
+        parser.error("--db takes one directory at a time; use --jobs 1")
+    start_time = time.perf_counter()
+
+    missing = [d for d in args.directories if not os.path.isdir(d)]
+    for directory in missing:
+        print(f"FAILED {directory}: not a directory", file=sys.stderr)
+    directories = [d for d in args.directories if d not in missing]
+
+    failures = len(missing)
+    history_records = {}
+    with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+        futures = {
+            executor.submit(process_directory, directory, output_dir, args.runs, args.all_runs,
+                            args.workers, args.cache, args.history, args.memory_limit,
+                            args.run_matrix, args.export_format, args.database): directory
+            for directory, output_dir in zip(directories, output_dirs_for(directories, args.output_dir))
+        }
+        for future in as_completed(futures):
+            directory = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                failures += 1
+                print(f"FAILED {directory}: {e}", file=sys.stderr)
+                continue
+            if result['history'] is not None and len(result['history']):
+                history_records[directory] = result['history']
+            print(f"OK {directory}: {result['files']} files, {result['runs']} runs, "
+                  f"load {result['load_seconds']:.2f}s, total {result['total_seconds']:.2f}s")
+
+    if args.history:
+        save_history(args.history, [history_records[d] for d in directories if d in history_records])
+
+    print(f"Processed {len(args.directories) - failures}/{len(args.directories)} directories "
+          f"in {time.perf_counter() - start_time:.2f}s")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+import os
+import sys
+import argparse
+
+from backEnd import BUNDLE_EXTENSION, section_record_ranges
+
+
+def pack_bundle(directory, bundle_path):
+    """
+    Concatenate every .sec file in directory into one section bundle, in the order the
+    loader reads them so a repeated section name resolves the same way.
+    Each file must split back into exactly one record (its header line followed by rows
+    that all contain commas), otherwise ValueError names the file and nothing is written.
+    Returns a dictionary describing what was written.
+    """
+    files = [file for file in os.listdir(directory) if file.lower().endswith('.sec')]
+    tmp_path = bundle_path + ".tmp"
+    written = 0
+    try:
+        with open(tmp_path, 'wb') as out:
+            for file in files:
+                with open(os.path.join(directory, file), 'rb') as f:
+                    data = f.read()
+                if len(section_record_ranges(data)) != 1:
+                    raise ValueError(f"{file} does not read back as a single section record")
+                if not data.endswith(b'\n'):
+                    data += b'\n'
+                out.write(data)
+                written += len(data)
+        os.replace(tmp_path, bundle_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return {
+        'bundle': bundle_path,
+        'sections': len(files),
+        'bytes': written
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pack a directory's .sec files into one section bundle.")
+    parser.add_argument("directory", help="directory of .sec files")
+    parser.add_argument("bundle", help=f"bundle file to write; {BUNDLE_EXTENSION} is added if missing")
+    args = parser.parse_args(argv)
+
+    bundle_path = args.bundle
+    if not bundle_path.lower().endswith(BUNDLE_EXTENSION):
+        bundle_path += BUNDLE_EXTENSION
+    if os.path.abspath(os.path.dirname(bundle_path)) == os.path.abspath(args.directory):
+        # The loader would read every section twice, once from each source
+        print(f"Warning: {bundle_path} is next to the .sec files it holds; move one or the other before loading")
+    try:
+        info = pack_bundle(args.directory, bundle_path)
+    except (OSError, ValueError) as e:
+        print(f"Could not pack {args.directory}: {e}", file=sys.stderr)
+        return 1
+    print(f"Packed {info['sections']} sections ({info['bytes']} bytes) into {info['bundle']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,576 @@
+"""
+SQLite storage engine for GPAProcessor.
+
+SQLiteGPAProcessor keeps enrollments, groups and runs in a local SQLite database
+instead of in-memory DataFrames. Directories are ingested incrementally (only
+section files whose mtime/size changed are parsed again), several directories can
+share one database, and an existing archive opens without re-reading any files:
+
+    processor = SQLiteGPAProcessor("archive.db")
+    processor.load_files_to_dataframes("Fall2024")   # ingest, or open as-is
+    processor.select_run("FIRSTRUN")
+    processor.calculate_all_gpas()
+    processor.populate_good_work_lists()
+
+Only per-section statistics and the group/run layout are held in memory; student
+GPAs, lists and run filtering are indexed queries.
+"""
+import os
+import time
+import sqlite3
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+from backEnd import (GPAProcessor, GradeCube, DISTRIBUTION_GRADES, GRADE_MAP, GOOD_LIST_MIN_GRADE, WORK_LIST_MAX_GRADE,
+                     SECTION_COLUMNS, PARALLEL_MIN_FILES, BUNDLE_EXTENSION, StudentList, list_file_type,
+                     parse_bundle_records, parse_group_file, parse_list_file, parse_run_file, parse_section_codes,
+                     parse_section_file, profiled, read_bundle_ranges)
+
+# Bump when the schema changes; older databases are rejected rather than misread
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT NOT NULL,
+    record INTEGER NOT NULL,
+    directory TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    section TEXT NOT NULL,
+    PRIMARY KEY (path, record)
+);
+CREATE INDEX IF NOT EXISTS files_section ON files (section);
+CREATE TABLE IF NOT EXISTS sections (
+    name TEXT PRIMARY KEY,
+    credit_hours REAL NOT NULL,
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS enrollments (
+    section TEXT NOT NULL,
+    row INTEGER NOT NULL,
+    student_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    grade TEXT NOT NULL,
+    points REAL,
+    first_in_section INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS enrollments_student ON enrollments (student_id);
+CREATE INDEX IF NOT EXISTS enrollments_section ON enrollments (section, row);
+CREATE TABLE IF NOT EXISTS section_stats (
+    section TEXT PRIMARY KEY,
+    points REAL NOT NULL,
+    graded INTEGER NOT NULL,
+    credit_hours REAL NOT NULL,
+    {grade_columns}
+);
+CREATE TABLE IF NOT EXISTS groups (
+    path TEXT PRIMARY KEY,
+    directory TEXT NOT NULL,
+    group_key TEXT NOT NULL UNIQUE,
+    group_name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS group_sections (
+    group_path TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    section TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS group_sections_group ON group_sections (group_path, position);
+CREATE INDEX IF NOT EXISTS group_sections_section ON group_sections (section);
+CREATE TABLE IF NOT EXISTS runs (
+    path TEXT PRIMARY KEY,
+    directory TEXT NOT NULL,
+    run_key TEXT NOT NULL UNIQUE,
+    semester TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS run_groups (
+    run_path TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    group_name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS run_groups_run ON run_groups (run_path, position);
+CREATE TEMP TABLE active_sections (name TEXT PRIMARY KEY);
+CREATE TEMP TABLE selected_students (student_id TEXT PRIMARY KEY);
+""".format(grade_columns=",\n    ".join(f'"{grade}" INTEGER NOT NULL' for grade in DISTRIBUTION_GRADES))
+
+# Fills section_stats for the sections listed in selected sections; see _update_section_stats.
+# Driven from sections so a section with a header but no rows still gets a (zero) stats row
+SECTION_STATS_QUERY = """
+INSERT INTO section_stats
+SELECT s.name, COALESCE(SUM(e.points), 0), COUNT(e.points), s.credit_hours, {grade_counts}
+FROM sections s LEFT JOIN enrollments e ON e.section = s.name
+WHERE s.name IN ({placeholders})
+GROUP BY s.name
+""".replace("{grade_counts}", ", ".join(f"COALESCE(SUM(e.grade = '{grade}'), 0)" for grade in DISTRIBUTION_GRADES))
+
+
+class SQLiteSectionView(Mapping):
+    """
+    Read-only dict-like view of the sections in the database, like backEnd.SectionView.
+    A section's DataFrame is queried only when it is accessed.
+    """
+    def __init__(self, connection, names):
+        self.connection = connection
+        self.names = list(names)
+        self._name_set = set(self.names)
+
+    def __getitem__(self, section_name):
+        if section_name not in self._name_set:
+            raise KeyError(section_name)
+        rows = self.connection.execute(
+            "SELECT name, student_id, grade, points FROM enrollments WHERE section = ? ORDER BY row",
+            (section_name,)).fetchall()
+        df = pd.DataFrame(rows, columns=SECTION_COLUMNS)
+        df['Numeric Grade'] = df['Numeric Grade'].astype(np.float64)
+        return df
+
+    def __contains__(self, section_name):
+        return section_name in self._name_set
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def copy(self):
+        return SQLiteSectionView(self.connection, self.names)
+
+    def subset(self, section_names):
+        """Return a view restricted to the given sections, keeping load order."""
+        section_names = set(section_names)
+        return SQLiteSectionView(self.connection, [n for n in self.names if n in section_names])
+
+
+class SQLiteGPAProcessor(GPAProcessor):
+    """
+    GPAProcessor whose enrollments live in an SQLite database at database_path.
+    Anything already in the database is available as soon as it is opened.
+    """
+    def __init__(self, database_path):
+        super().__init__()
+        self.database_path = database_path
+        # Loads run on the UI's worker thread; the UI never queries while one is running
+        self.connection = sqlite3.connect(database_path, check_same_thread=False)
+        self.connection.executescript("PRAGMA journal_mode = WAL;")
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            raise ValueError(f"{database_path} uses schema version {version}, expected {SCHEMA_VERSION}")
+        self.connection.executescript(SCHEMA)
+        self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._load_from_database()
+
+    def close(self):
+        self.connection.close()
+
+    @profiled('load', rows=lambda self: self.load_stats.get('parsed_files', 0))
+    def load_files_to_dataframes(self, directory, workers=1, use_cache=False, progress=None, cancel_event=None):
+        """
+        Ingest the .sec, .secbundle, .grp, .run and .runthis files of a directory into the
+        database, then load the combined archive. Only section files and bundles whose mtime
+        or size changed since they were last ingested are parsed; files deleted from the
+        directory are dropped from the database. use_cache is ignored, as the database is the cache.
+        good*.lst and work*.lst files are added to the student history store.
+        """
+        if progress is not None:
+            progress('Listing files', None, None)
+        start_time = time.perf_counter()
+        directory = os.path.abspath(directory)
+        extensions = ('.run', '.grp', '.sec', '.runthis', BUNDLE_EXTENSION)
+
+        section_paths, bundle_paths, group_paths, run_paths = [], [], [], []
+        section_sources = []  # .sec files and bundles in directory order
+        file_stats = {}
+        history_records = []
+        for file in os.listdir(directory):
+            file_path = os.path.join(directory, file)
+            list_type = list_file_type(file)
+            if list_type is not None:
+                try:
+                    history_records.append(parse_list_file(file_path, list_type))
+                except Exception as e:
+                    print(f"Could not read {file}: {e}")
+                    raise
+            elif file.lower().endswith(extensions):
+                file_stats[file_path] = os.stat(file_path)
+                ext = os.path.splitext(file)[1].lower()
+                if ext == '.sec':
+                    section_paths.append(file_path)
+                    section_sources.append(file_path)
+                elif ext == BUNDLE_EXTENSION:
+                    bundle_paths.append(file_path)
+                    section_sources.append(file_path)
+                elif ext == '.grp':
+                    group_paths.append(file_path)
+                else:
+                    run_paths.append(file_path)
+
+        known = {path: (mtime_ns, size) for path, mtime_ns, size in self.connection.execute(
+            "SELECT DISTINCT path, mtime_ns, size FROM files WHERE directory = ?", (directory,))}
+        to_parse = [path for path in section_sources
+                    if known.get(path) != (file_stats[path].st_mtime_ns, file_stats[path].st_size)]
+        removed = [path for path in known if path not in file_stats]
+        # A .sec file holds one section; a bundle holds one per record, in bundle order
+        sec_paths = [path for path in to_parse if path.lower().endswith('.sec')]
+        parsed_by_path = {path: [parsed] for path, parsed in zip(
+            sec_paths, self._parse_sections(sec_paths, workers, progress, cancel_event))}
+        for path in to_parse:
+            if path not in parsed_by_path:
+                parsed_by_path[path] = self._parse_bundle(path, workers, progress, cancel_event)
+
+        if progress is not None:
+            progress('Writing database', None, None)
+        with self.connection:
+            touched = self._remove_section_files(removed + to_parse)
+            self.connection.executemany(
+                "INSERT INTO files (path, record, directory, mtime_ns, size, section) VALUES (?, ?, ?, ?, ?, ?)",
+                [(path, record, directory, file_stats[path].st_mtime_ns, file_stats[path].st_size, parsed['section'])
+                 for path, parsed_sections in parsed_by_path.items()
+                 for record, parsed in enumerate(parsed_sections)])
+            touched.update(parsed['section'] for parsed_sections in parsed_by_path.values()
+                           for parsed in parsed_sections)
+            # Every file holding a changed section is kept, but only the winning file's rows are stored
+            winners = self._winning_files(directory, section_sources, touched)
+            self._insert_sections(directory, self._read_sources(winners, parsed_by_path))
+            # Sections no file holds any more lose their place in the load order
+            self.connection.execute("DELETE FROM sections WHERE name NOT IN (SELECT section FROM files)")
+            self._update_section_stats(touched)
+            self._replace_layout(directory, group_paths, run_paths)
+
+        self._load_from_database()
+        self.directory = directory
+        self.selected_run = None
+        self._file_signatures = {os.path.basename(path): (stat.st_mtime_ns, stat.st_size)
+                                 for path, stat in file_stats.items()}
+
+        if history_records:
+            self.history.add(pd.concat(history_records, ignore_index=True))
+            if self.history_path is not None:
+                self.history.save(self.history_path)
+
+        elapsed = time.perf_counter() - start_time
+        if workers is None:
+            workers = os.cpu_count() or 1
+        self.load_stats = {
+            'files': len(self.section_dfs) + len(self.group_dfs) + len(self.run_dfs),
+            'section_files': len(section_paths),
+            'bundles': len(bundle_paths),
+            'parsed_files': len(to_parse),
+            'cached_files': len(section_sources) - len(to_parse),
+            'workers': workers if len(to_parse) >= PARALLEL_MIN_FILES else 1,
+            'seconds': elapsed,
+            'files_per_sec': len(section_paths) / elapsed if elapsed > 0 else 0.0
+        }
+        return len(self.section_dfs) + len(self.group_dfs) + len(self.run_dfs)
+
+    def _remove_section_files(self, paths):
+        """
+        Delete the rows ingested from the given files. Returns the affected section names.
+        The sections rows stay, so a re-ingested section keeps its position in the load order.
+        """
+        removed_sections = set()
+        for path in paths:
+            sections = [section for (section,) in self.connection.execute(
+                "SELECT section FROM files WHERE path = ?", (path,))]
+            removed_sections.update(sections)
+            self.connection.execute("DELETE FROM files WHERE path = ?", (path,))
+            self.connection.executemany("DELETE FROM enrollments WHERE section = ?",
+                                        [(section,) for section in sections])
+        return removed_sections
+
+    def _winning_files(self, directory, section_sources, section_names):
+        """
+        The (path, record) each of section_names is read from: of the directory's files and
+        bundle records holding it, the last in directory order, as in a single-directory load.
+        Returned in the order the sections first appear, which is where a new section takes its place.
+        """
+        order = {path: position for position, path in enumerate(section_sources)}
+        holders = sorted(((order[path], record), path, section) for path, record, section in self.connection.execute(
+            "SELECT path, record, section FROM files WHERE directory = ?", (directory,)) if section in section_names)
+        winners, first = {}, {}
+        for position, path, section in holders:
+            first.setdefault(section, position)
+            winners[section] = (path, position[1])
+        return [winners[section] for section in sorted(winners, key=first.get)]
+
+    @staticmethod
+    def _read_sources(sources, parsed_by_path):
+        """
+        The parsed sections at the given (path, record) sources, in order: taken from
+        parsed_by_path when the file was just parsed, otherwise read again from the file.
+        A bundle is mapped once and only the records asked for are parsed.
+        """
+        bundle_records = {}
+        for path, record in sources:
+            if path not in parsed_by_path and not path.lower().endswith('.sec'):
+                bundle_records.setdefault(path, []).append(record)
+        reread = {}
+        for path, records in bundle_records.items():
+            ranges = read_bundle_ranges(path)
+            reread.update(zip(((path, record) for record in records),
+                              parse_bundle_records(path, [ranges[record] for record in records])))
+        return [parsed_by_path[path][record] if path in parsed_by_path
+                else reread[(path, record)] if (path, record) in reread
+                else parse_section_file(path) for path, record in sources]
+
+    def _insert_sections(self, directory, parsed_sections):
+        """Store the enrollments of parsed sections, each the winning copy of its section, in load order."""
+        position = self.connection.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM sections").fetchone()[0]
+        rows = []
+        for parsed in parsed_sections:
+            section = parsed['section']
+            # A section already ingested from another directory is replaced, as in a single-directory load
+            self.connection.execute("DELETE FROM files WHERE section = ? AND directory != ?", (section, directory))
+            self.connection.execute("DELETE FROM enrollments WHERE section = ?", (section,))
+            self.connection.execute(
+                "INSERT INTO sections (name, credit_hours, position) VALUES (?, ?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET credit_hours = excluded.credit_hours",
+                (section, parsed['credit_hours'], position))
+            position += 1
+            
+            seen = set()
+            for row, (name, student_id, grade) in enumerate(zip(parsed['names'], parsed['ids'], parsed['grades'])):
+                # Only a student's first row in a section counts towards their GPA
+                first = student_id not in seen
+                seen.add(student_id)
+                rows.append((section, row, student_id, name, grade, GRADE_MAP.get(grade), int(first)))
+        self.connection.executemany(
+            "INSERT INTO enrollments (section, row, student_id, name, grade, points, first_in_section) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def _update_section_stats(self, section_names):
+        """Recompute the stored per-section statistics of the given sections."""
+        section_names = list(section_names)
+        # Stay well under SQLite's limit on bound parameters
+        for start in range(0, len(section_names), 500):
+            batch = section_names[start:start + 500]
+            placeholders = ", ".join("?" * len(batch))
+            self.connection.execute(f"DELETE FROM section_stats WHERE section IN ({placeholders})", batch)
+            self.connection.execute(SECTION_STATS_QUERY.replace("{placeholders}", placeholders), batch)
+
+    def _replace_layout(self, directory, group_paths, run_paths):
+        """Replace the directory's groups and runs with the given files; a key seen in another directory is replaced."""
+        for table, members, key_column, member_column in (('groups', 'group_sections', 'group_key', 'group_path'),
+                                                          ('runs', 'run_groups', 'run_key', 'run_path')):
+            paths = group_paths if table == 'groups' else run_paths
+            keys = [os.path.splitext(os.path.basename(path))[0] for path in paths]
+            stale = self.connection.execute(
+                f"SELECT path FROM {table} WHERE directory = ? OR {key_column} IN ({', '.join('?' * len(keys))})",
+                [directory] + keys).fetchall()
+            for (path,) in stale:
+                self.connection.execute(f"DELETE FROM {members} WHERE {member_column} = ?", (path,))
+                self.connection.execute(f"DELETE FROM {table} WHERE path = ?", (path,))
+
+        for path in group_paths:
+            df = self._parse_layout_file(parse_group_file, path)
+            group_name = df['Group Name'].iloc[0] if len(df) else ""
+            self.connection.execute("INSERT INTO groups (path, directory, group_key, group_name) VALUES (?, ?, ?, ?)",
+                                    (path, directory, os.path.splitext(os.path.basename(path))[0], group_name))
+            self.connection.executemany("INSERT INTO group_sections (group_path, position, section) VALUES (?, ?, ?)",
+                                        [(path, i, section) for i, section in enumerate(df['Section'])])
+        for path in run_paths:
+            df = self._parse_layout_file(parse_run_file, path)
+            semester = df['Semester'].iloc[0] if len(df) else ""
+            self.connection.execute("INSERT INTO runs (path, directory, run_key, semester) VALUES (?, ?, ?, ?)",
+                                    (path, directory, os.path.splitext(os.path.basename(path))[0], semester))
+            self.connection.executemany("INSERT INTO run_groups (run_path, position, group_name) VALUES (?, ?, ?)",
+                                        [(path, i, group) for i, group in enumerate(df['Group'])])
+
+    @staticmethod
+    def _parse_layout_file(parse, path):
+        """Parse a .grp or .run file, naming the file before the error propagates."""
+        try:
+            return parse(path)
+        except Exception as e:
+            print(f"Could not read {os.path.basename(path)}: {e}")
+            raise
+
+    def _load_from_database(self):
+        """Read the per-section statistics and the group/run layout of the whole archive."""
+        stats = pd.read_sql_query(
+            "SELECT st.* FROM section_stats st JOIN sections s ON s.name = st.section ORDER BY s.position",
+            self.connection)
+        self.section_stats = stats.rename(columns={'section': 'Section'}).set_index('Section')
+        self.section_terms = parse_section_codes(self.section_stats.index)
+        self.section_credit_hours = dict(self.connection.execute("SELECT name, credit_hours FROM sections"))
+        self.all_section_dfs = SQLiteSectionView(self.connection, self.section_stats.index)
+        self.section_dfs = self.all_section_dfs.copy()
+
+        self.all_group_dfs = {}
+        for path, group_key, group_name in self.connection.execute(
+                "SELECT path, group_key, group_name FROM groups ORDER BY rowid").fetchall():
+            sections = [section for (section,) in self.connection.execute(
+                "SELECT section FROM group_sections WHERE group_path = ? ORDER BY position", (path,))]
+            self.all_group_dfs[group_key] = pd.DataFrame({'Group Name': [group_name] * len(sections),
+                                                          'Section': sections})
+        self.group_dfs = self.all_group_dfs.copy()
+        self._all_group_members = self._build_group_members(self.all_group_dfs)
+        self.grade_cube = GradeCube(self.section_stats, self.section_terms, self._all_group_members)
+
+        self.run_dfs = {}
+        for path, run_key, semester in self.connection.execute(
+                "SELECT path, run_key, semester FROM runs ORDER BY rowid").fetchall():
+            groups = [group for (group,) in self.connection.execute(
+                "SELECT group_name FROM run_groups WHERE run_path = ? ORDER BY position", (path,))]
+            self.run_dfs[run_key] = pd.DataFrame({'Semester': [semester] * len(groups), 'Group': groups})
+
+        self.section_gpas = {}
+        self.group_gpas = {}
+        self._sync_active_sections()
+
+    def _sync_active_sections(self):
+        """Mirror the selected sections into the active_sections table the queries join against."""
+        with self.connection:
+            self.connection.execute("DELETE FROM active_sections")
+            self.connection.executemany("INSERT INTO active_sections (name) VALUES (?)",
+                                        [(name,) for name in self.section_dfs])
+        self._clear_student_caches()
+
+    def _select_students(self, student_ids):
+        with self.connection:
+            self.connection.execute("DELETE FROM selected_students")
+            self.connection.executemany("INSERT OR IGNORE INTO selected_students (student_id) VALUES (?)",
+                                        [(student_id,) for student_id in student_ids])
+
+    def reset_to_all_data(self):
+        super().reset_to_all_data()
+        self._sync_active_sections()
+
+    @profiled('select run', rows=lambda self: len(self.section_dfs))
+    def select_run(self, run_file_name):
+        """
+        Select the groups listed in a run file and the sections in those groups.
+        """
+        if run_file_name not in self.run_dfs:
+            raise ValueError(f"Run file '{run_file_name}' not found.")
+        group_keys = {group_key for (group_key,) in self.connection.execute(
+            "SELECT g.group_key FROM runs r "
+            "JOIN run_groups rg ON rg.run_path = r.path "
+            "JOIN groups g ON g.group_name = rg.group_name "
+            "WHERE r.run_key = ?", (run_file_name,))}
+        sections = {section for (section,) in self.connection.execute(
+            "SELECT DISTINCT gs.section FROM runs r "
+            "JOIN run_groups rg ON rg.run_path = r.path "
+            "JOIN groups g ON g.group_name = rg.group_name "
+            "JOIN group_sections gs ON gs.group_path = g.path "
+            "WHERE r.run_key = ?", (run_file_name,))}
+        self.group_dfs = {key: df for key, df in self.all_group_dfs.items() if key in group_keys}
+        self.section_dfs = self.all_section_dfs.subset(sections)
+        self.selected_run = run_file_name
+        self._sync_active_sections()
+
+    def _update_group_gpas(self, group_names):
+        """
+        Recalculate the given groups' GPAs as credit-hour weighted averages of their selected sections.
+        """
+        group_names = list(group_names)
+        totals = {group_key: (points, credits) for group_key, points, credits in self.connection.execute(
+            "SELECT g.group_key, SUM(st.points * st.credit_hours), SUM(st.graded * st.credit_hours) "
+            "FROM groups g "
+            "JOIN group_sections gs ON gs.group_path = g.path "
+            "JOIN active_sections a ON a.name = gs.section "
+            "JOIN section_stats st ON st.section = gs.section "
+            "GROUP BY g.group_key")}
+        for group_name in group_names:
+            points, credits = totals.get(group_name, (0.0, 0.0))
+            self.group_gpas[group_name] = points / credits if credits else None
+
+    def _list_candidates(self):
+        """Rows across every section that may put a student on a good or work list."""
+        rows = self.connection.execute(
+            "SELECT section, student_id, points FROM enrollments WHERE points >= ? OR points <= ?",
+            (GRADE_MAP[GOOD_LIST_MIN_GRADE], GRADE_MAP[WORK_LIST_MAX_GRADE])).fetchall()
+        sections, student_ids, points = zip(*rows) if rows else ((), (), ())
+        return pd.DataFrame({
+            'Section': pd.Categorical(sections),
+            'ID': pd.Categorical(student_ids),
+            'Numeric Grade': np.array(points, dtype=np.float64)
+        })
+
+    def _active_student_ids(self):
+        return [student_id for (student_id,) in self.connection.execute(
+            "SELECT DISTINCT e.student_id FROM enrollments e JOIN active_sections a ON a.name = e.section")]
+
+    def build_student_list(self, min_grade=None, max_grade=None, sections=None):
+        """
+        Find students with at least one grade between min_grade and max_grade (inclusive,
+        compared by grade points) in the selected sections. See GPAProcessor.build_student_list.
+        """
+        conditions = ["e.points IS NOT NULL"]
+        parameters = []
+        if min_grade is not None:
+            conditions.append("e.points >= ?")
+            parameters.append(GRADE_MAP[min_grade])
+        if max_grade is not None:
+            conditions.append("e.points <= ?")
+            parameters.append(GRADE_MAP[max_grade])
+        if sections is not None:
+            sections = list(sections)
+            conditions.append(f"e.section IN ({', '.join('?' * len(sections))})")
+            parameters.extend(sections)
+
+        rows = self.connection.execute(
+            "SELECT e.student_id, e.name, e.section FROM enrollments e "
+            "JOIN active_sections a ON a.name = e.section "
+            "JOIN sections s ON s.name = e.section "
+            f"WHERE {' AND '.join(conditions)} ORDER BY s.position, e.row", parameters).fetchall()
+        if not rows:
+            return StudentList.empty()
+        return StudentList.from_records(*zip(*rows))
+
+    def get_student_gpas(self, student_ids):
+        """
+        Calculate GPAs for many students at once.
+        Returns a dictionary of student ID -> GPA (None when the student has no graded sections).
+        """
+        student_ids = list(student_ids)
+        self._select_students(student_ids)
+        gpas = {student_id: (points / credits if credits else None) for student_id, points, credits in self.connection.execute(
+            "SELECT e.student_id, SUM(e.points * s.credit_hours), SUM(s.credit_hours) "
+            "FROM selected_students t "
+            "JOIN enrollments e ON e.student_id = t.student_id "
+            "JOIN active_sections a ON a.name = e.section "
+            "JOIN sections s ON s.name = e.section "
+            "WHERE e.first_in_section = 1 AND e.points IS NOT NULL "
+            "GROUP BY e.student_id")}
+        return {student_id: gpas.get(student_id) for student_id in student_ids}
+
+    def _section_grades(self, student_ids):
+        self._select_students(student_ids)
+        return pd.DataFrame(self.connection.execute(
+            "SELECT e.student_id, e.section, e.grade "
+            "FROM selected_students t "
+            "JOIN enrollments e ON e.student_id = t.student_id "
+            "JOIN active_sections a ON a.name = e.section "
+            "WHERE e.first_in_section = 1").fetchall(), columns=['ID', 'Section', 'Grade'], dtype=object)
+
+    def get_student_enrollments(self, student_id):
+        """
+        Get every section, grade and credit-hour row for a student across all loaded sections.
+        """
+        rows = self.connection.execute(
+            "SELECT e.section, e.grade, s.credit_hours, e.points FROM enrollments e "
+            "JOIN sections s ON s.name = e.section "
+            "WHERE e.student_id = ? ORDER BY s.position, e.row", (student_id,)).fetchall()
+        df = pd.DataFrame(rows, columns=['Section', 'Grade', 'Credit Hours', 'Numeric Grade'])
+        df['Numeric Grade'] = df['Numeric Grade'].astype(np.float64)
+        return df
+
+    @profiled('refresh')
+    def refresh_changed_files(self):
+        """
+        Re-ingest the files added, modified or deleted since the last load or refresh,
+        then recompute GPAs and lists for the current run selection.
+        Returns the (added, modified, deleted) file names.
+        """
+        added, modified, deleted = self.scan_for_changes()
+        if not (added or modified or deleted):
+            return added, modified, deleted
+        selected_run = self.selected_run
+        self.load_files_to_dataframes(self.directory)
+        if selected_run in self.run_dfs:
+            self.select_run(selected_run)
+        self.calculate_all_gpas()
+        self.populate_good_work_lists()
+        return added, modified, deleted